@@ -1,15 +1,95 @@
+import argparse
 import logging
+import sys
 
-from animeon.core import AnimeAPI
-from animeon.core.http import HTTPClient
-from animeon.ui import CLI, ContentSelector, MpvPlayer, Prompt
-from animeon.ui.commands import SearchCommand
-from animeon.ui.preview import AnimePreviewGenerator
-from animeon.utils import LoggerManager, check_dependencies
+from animeon.ui.cli import CLI
+from animeon.utils.logging import LoggerManager
 
 logger = logging.getLogger(__name__)
 
 
+def run(cli: CLI, args: argparse.Namespace) -> None:
+    """
+    Creates application components and runs the parsed command.
+
+    Heavy modules are imported here rather than at module level, so that
+    --help and --version do not pay for them.
+
+    Args:
+        cli: CLI application.
+        args: Parsed CLI arguments.
+    """
+    from animeon.core import (
+        AnimeAPI,
+        AnimeCatalog,
+        HTTPClient,
+        Prefetcher,
+        SQLiteResponseCache,
+    )
+    from animeon.ui import ContentSelector, MpvPlayer, PersistentPrompt
+    from animeon.ui.commands import ResolveCommand, SearchCommand, SyncCommand
+    from animeon.ui.preview import AnimePreviewGenerator
+
+    # Initializes components
+    with HTTPClient() as http_client:
+        response_cache = SQLiteResponseCache()
+        catalog = AnimeCatalog()
+        use_catalog = getattr(args, "catalog", False)
+        # Only searches with --catalog update it, sync fills it explicitly
+        api_client = AnimeAPI(
+            http_client,
+            cache=response_cache,
+            catalog=catalog if use_catalog else None,
+        )
+        prompt = PersistentPrompt()
+        preview_generator = AnimePreviewGenerator(http_client)
+        selector = ContentSelector(prompt, preview_generator)
+        player = MpvPlayer()
+        prefetcher = Prefetcher()
+
+        # Configures response cache
+        if args.no_cache:
+            api_client.cache = None
+        api_client.refresh = args.refresh
+
+        commands = {
+            "search": SearchCommand(
+                api_client,
+                selector,
+                player,
+                prefetcher,
+                live_search=getattr(args, "live", False),
+                use_catalog=use_catalog,
+            ),
+            "resolve": ResolveCommand(api_client, getattr(args, "jobs", None)),
+            "sync": SyncCommand(api_client, catalog, getattr(args, "jobs", None)),
+        }
+        try:
+            cli.run(args, commands)
+        finally:
+            selector.close()
+            prefetcher.close()
+            response_cache.close()
+            catalog.close()
+
+
+def report_profile(args: argparse.Namespace) -> None:
+    """
+    Prints collected profiling data and writes it to a file if requested.
+
+    Args:
+        args: Parsed CLI arguments.
+    """
+    if not (args.profile or args.profile_output):
+        return
+
+    from animeon.utils.profiling import profiler
+
+    print(profiler.summary(), file=sys.stderr)
+    if args.profile_output:
+        profiler.dump(args.profile_output, args.profile_format)
+
+
 def main() -> None:
     """Main entry point of the application."""
     try:
@@ -17,27 +97,31 @@ def main() -> None:
         logger_manager = LoggerManager()
         logger_manager.setup_logging()
 
-        # Checks dependencies
-        check_dependencies()
-
-        # Initializes components
-        http_client = HTTPClient()
-        api_client = AnimeAPI(http_client)
-        prompt = Prompt()
-        preview_generator = AnimePreviewGenerator(http_client)
-        selector = ContentSelector(prompt, preview_generator)
-        player = MpvPlayer()
-
-        # Runs CLI
-        commands = {"search": SearchCommand(api_client, selector, player)}
-        cli = CLI(commands)
+        # Parses arguments before anything else, so --help and --version are fast
+        cli = CLI()
         args = cli.parse_args()
 
         # Enables debug level
         if args.debug:
             logger_manager.enable_debug()
 
-        cli.run(args)
+        # Enables profiling
+        if args.profile or args.profile_output:
+            from animeon.utils.profiling import profiler
+
+            profiler.enable()
+
+        # Checks dependencies
+        from animeon.utils.dependencies import check_dependencies
+
+        # Batch commands do not use fzf or mpv
+        if args.command == "search" and check_dependencies():
+            sys.exit(1)
+
+        try:
+            run(cli, args)
+        finally:
+            report_profile(args)
     except KeyboardInterrupt:
         logger.info("Exiting...")
     except Exception as error:
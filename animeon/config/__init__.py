@@ -1,4 +1,19 @@
 from .api import ApiConfig
+from .cache import CacheConfig
+from .catalog import CatalogConfig
+from .http import HttpConfig
 from .logging import LoggingConfig
+from .preview import PreviewConfig
+from .rate_limit import RateLimitConfig
+from .search import SearchConfig
 
-__all__ = ["ApiConfig", "LoggingConfig"]
+__all__ = [
+    "ApiConfig",
+    "CacheConfig",
+    "CatalogConfig",
+    "HttpConfig",
+    "LoggingConfig",
+    "PreviewConfig",
+    "RateLimitConfig",
+    "SearchConfig",
+]
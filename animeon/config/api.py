@@ -7,6 +7,8 @@ from .base import BaseConfig
 @dataclass
 class ApiConfig(BaseConfig):
     timeout: int
+    max_workers: int
+    prefetch_count: int
 
     @classmethod
     def default(cls: Type["ApiConfig"]) -> "ApiConfig":
@@ -19,4 +21,4 @@ class ApiConfig(BaseConfig):
         Returns:
             Default ApiConfig instance.
         """
-        return cls(timeout=30)
+        return cls(timeout=30, max_workers=4, prefetch_count=5)
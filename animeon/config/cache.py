@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Dict, Type
+
+from .base import BaseConfig
+
+
+@dataclass
+class CacheConfig(BaseConfig):
+    """
+    Cache configuration.
+
+    Attributes:
+        poster_max_size: Maximum total size of cached posters in bytes.
+        poster_max_age: Time in seconds during which a cached poster is used without revalidation.
+        render_max_size: Maximum total size of cached chafa output in bytes.
+        response_ttls: Time in seconds during which cached API responses are fresh, by endpoint family.
+        response_stale_ttl: Time in seconds after expiry during which a stale response is served while it is refreshed in the background.
+    """
+
+    poster_max_size: int
+    poster_max_age: int
+    render_max_size: int
+    response_ttls: Dict[str, int]
+    response_stale_ttl: int
+
+    @classmethod
+    def default(cls: Type["CacheConfig"]) -> "CacheConfig":
+        """
+        Creates default configuration.
+
+        Args:
+            cls: Class type.
+
+        Returns:
+            Default CacheConfig instance.
+        """
+        return cls(
+            poster_max_size=100 * 1024 * 1024,
+            poster_max_age=7 * 24 * 60 * 60,
+            render_max_size=20 * 1024 * 1024,
+            response_ttls={
+                "search": 10 * 60,
+                "fandubs": 24 * 60 * 60,
+                "episodes": 24 * 60 * 60,
+                "episode": 0,  # Video URLs may expire
+            },
+            response_stale_ttl=7 * 24 * 60 * 60,
+        )
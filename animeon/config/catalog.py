@@ -0,0 +1,42 @@
+import string
+from dataclasses import dataclass
+from typing import List, Type
+
+from .base import BaseConfig
+
+
+@dataclass
+class CatalogConfig(BaseConfig):
+    """
+    Local anime catalog configuration.
+
+    Attributes:
+        max_results: Maximum number of results of a local search.
+        min_score: Minimum share of query trigrams a title must contain to match.
+        sync_queries: Search queries used to crawl the catalog by `animeon sync`.
+    """
+
+    max_results: int
+    min_score: float
+    sync_queries: List[str]
+
+    @classmethod
+    def default(cls: Type["CatalogConfig"]) -> "CatalogConfig":
+        """
+        Creates default configuration.
+
+        Args:
+            cls: Class type.
+
+        Returns:
+            Default CatalogConfig instance.
+        """
+        return cls(
+            max_results=50,
+            min_score=0.5,
+            sync_queries=[
+                *"абвгґдеєжзиіїйклмнопрстуфхцчшщьюя",
+                *string.ascii_lowercase,
+                *string.digits,
+            ],
+        )
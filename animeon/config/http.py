@@ -0,0 +1,96 @@
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional, Type
+
+from .base import BaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HttpConfig(BaseConfig):
+    """
+    HTTP client configuration.
+
+    Attributes:
+        pool_connections: Number of per-host connection pools to keep.
+        pool_maxsize: Maximum number of keep-alive connections per host.
+        pool_block: Whether to wait for a free connection when the pool is exhausted.
+        record_path: Optional path to the fixture archive to record responses into.
+        replay_path: Optional path to the fixture archive to serve responses from
+            instead of the network.
+        replay_time_scale: Multiplier for recorded response times during replay.
+            Zero replays instantly.
+        max_retries: Maximum number of retries of a failed GET request.
+        retry_backoff: Base delay before the first retry, in seconds. Doubled
+            for every next retry and randomized with full jitter.
+        retry_backoff_max: Maximum delay before a retry, in seconds.
+        hedge_quantile: Latency quantile of the endpoint after which a hedged
+            request is sent. None disables hedging.
+        hedge_min_samples: Number of successful requests to the endpoint needed
+            before its latency quantile is trusted for hedging.
+    """
+
+    pool_connections: int
+    pool_maxsize: int
+    pool_block: bool
+    record_path: Optional[str] = None
+    replay_path: Optional[str] = None
+    replay_time_scale: float = 1.0
+    max_retries: int = 2
+    retry_backoff: float = 0.2
+    retry_backoff_max: float = 5.0
+    hedge_quantile: Optional[float] = 0.95
+    hedge_min_samples: int = 20
+
+    @classmethod
+    def default(cls: Type["HttpConfig"]) -> "HttpConfig":
+        """
+        Creates default configuration.
+
+        Fixture options are read from ANIMEON_HTTP_RECORD, ANIMEON_HTTP_REPLAY
+        and ANIMEON_HTTP_REPLAY_SCALE environment variables.
+
+        Args:
+            cls: Class type.
+
+        Returns:
+            Default HttpConfig instance.
+        """
+        return cls(
+            pool_connections=4,
+            pool_maxsize=10,
+            pool_block=False,
+            record_path=os.environ.get("ANIMEON_HTTP_RECORD") or None,
+            replay_path=os.environ.get("ANIMEON_HTTP_REPLAY") or None,
+            replay_time_scale=cls._parse_time_scale(
+                os.environ.get("ANIMEON_HTTP_REPLAY_SCALE")
+            ),
+        )
+
+    @staticmethod
+    def _parse_time_scale(value: Optional[str]) -> float:
+        """
+        Parses replay time scale from the environment variable.
+
+        Args:
+            value: Variable value.
+
+        Returns:
+            Time scale if the value is a non-negative number, 1.0 otherwise.
+        """
+        if not value:
+            return 1.0
+
+        try:
+            scale = float(value)
+        except ValueError:
+            scale = -1.0
+
+        if not math.isfinite(scale) or scale < 0:
+            logger.warning(f"Invalid ANIMEON_HTTP_REPLAY_SCALE: {value}, using 1.0")
+            return 1.0
+
+        return scale
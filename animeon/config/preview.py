@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Optional, Type
+
+from .base import BaseConfig
+
+
+@dataclass
+class PreviewConfig(BaseConfig):
+    """
+    Preview configuration.
+
+    Attributes:
+        lazy: Whether to render previews on demand, only for the hovered item.
+        chafa_size: Size of the poster rendered by chafa.
+        download_workers: Maximum number of concurrent poster downloads in eager mode.
+        chafa_format: Optional chafa output format. Detected by chafa if not set.
+        chafa_colors: Optional chafa colour mode. Detected by chafa if not set.
+    """
+
+    lazy: bool
+    chafa_size: str
+    download_workers: int
+    chafa_format: Optional[str] = None
+    chafa_colors: Optional[str] = None
+
+    @classmethod
+    def default(cls: Type["PreviewConfig"]) -> "PreviewConfig":
+        """
+        Creates default configuration.
+
+        Args:
+            cls: Class type.
+
+        Returns:
+            Default PreviewConfig instance.
+        """
+        return cls(lazy=True, chafa_size="45x25", download_workers=8)
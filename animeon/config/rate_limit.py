@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Type
+
+from .base import BaseConfig
+
+
+@dataclass
+class RateLimitConfig(BaseConfig):
+    """
+    Client-side rate limiting configuration.
+
+    Attributes:
+        rate: Maximum request rate per host, in requests per second.
+        burst: Number of requests per host that can be made at once after idling.
+        min_rate: Lowest rate the limiter adapts down to after 429 responses.
+        decrease_factor: Multiplier applied to the rate of a host on a 429 response.
+        increase_step: Rate added back after every successful response, up to rate.
+        max_in_flight: Maximum number of concurrent requests across all hosts.
+        max_retry_after: Longest pause honored from a Retry-After header, in seconds.
+    """
+
+    rate: float
+    burst: int
+    min_rate: float
+    decrease_factor: float
+    increase_step: float
+    max_in_flight: int
+    max_retry_after: float = 60.0
+
+    @classmethod
+    def default(cls: Type["RateLimitConfig"]) -> "RateLimitConfig":
+        """
+        Creates default configuration.
+
+        Args:
+            cls: Class type.
+
+        Returns:
+            Default RateLimitConfig instance.
+        """
+        return cls(
+            rate=20.0,
+            burst=20,
+            min_rate=0.5,
+            decrease_factor=0.5,
+            increase_step=0.1,
+            max_in_flight=16,
+        )
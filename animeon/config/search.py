@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Type
+
+from .base import BaseConfig
+
+
+@dataclass
+class SearchConfig(BaseConfig):
+    """
+    Incremental search configuration.
+
+    Attributes:
+        debounce: Delay after the last keystroke before the search request, in seconds.
+        min_query_length: Minimum query length that triggers a search request.
+    """
+
+    debounce: float
+    min_query_length: int
+
+    @classmethod
+    def default(cls: Type["SearchConfig"]) -> "SearchConfig":
+        """
+        Creates default configuration.
+
+        Args:
+            cls: Class type.
+
+        Returns:
+            Default SearchConfig instance.
+        """
+        return cls(debounce=0.2, min_query_length=2)
@@ -1,4 +1,46 @@
-from .api import AnimeAPI
-from .http import HTTPClient
+from typing import TYPE_CHECKING
 
-__all__ = ["AnimeAPI", "HTTPClient"]
+from animeon.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .api import AnimeAPI
+    from .cache import (
+        DiskCache,
+        MemoryResponseCache,
+        PosterCache,
+        ResponseCache,
+        SQLiteResponseCache,
+    )
+    from .catalog import AnimeCatalog
+    from .http import HTTPClient
+    from .prefetch import Prefetcher
+    from .rate_limit import RateLimiter
+
+__all__ = [
+    "AnimeAPI",
+    "AnimeCatalog",
+    "DiskCache",
+    "HTTPClient",
+    "MemoryResponseCache",
+    "PosterCache",
+    "Prefetcher",
+    "RateLimiter",
+    "ResponseCache",
+    "SQLiteResponseCache",
+]
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "AnimeAPI": ".api",
+        "AnimeCatalog": ".catalog",
+        "DiskCache": ".cache",
+        "HTTPClient": ".http",
+        "MemoryResponseCache": ".cache",
+        "PosterCache": ".cache",
+        "Prefetcher": ".prefetch",
+        "RateLimiter": ".rate_limit",
+        "ResponseCache": ".cache",
+        "SQLiteResponseCache": ".cache",
+    },
+)
@@ -1,10 +1,18 @@
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Generator, Iterator, List, Optional, Set
 
 from animeon.config import ApiConfig
 from animeon.models import Anime, Episode, Fandub, Player
 from animeon.utils import build_url, normalize_query
+from animeon.utils.json_stream import iter_array_items
+from animeon.utils.profiling import profiler
 
+from .cache import ResponseCache
+from .catalog import AnimeCatalog
 from .http import HTTPClient
 
 logger = logging.getLogger(__name__)
@@ -15,9 +23,14 @@ class AnimeAPI:
 
     BASE_URL = "https://animeon.club"
     HEADERS = {"Referer": BASE_URL}
+    SEARCH_PARAMS = {"full": "true"}
 
     def __init__(
-        self, http_client: HTTPClient, config: Optional[ApiConfig] = None
+        self,
+        http_client: HTTPClient,
+        config: Optional[ApiConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        catalog: Optional[AnimeCatalog] = None,
     ) -> None:
         """
         Initializes the class.
@@ -25,27 +38,143 @@ class AnimeAPI:
         Args:
             http_client: HTTP client for making requests.
             config: Optional API configuration. If not provided, default configuration will be used.
+            cache: Optional cache of API responses. If not provided, responses are not cached.
+            catalog: Optional local catalog updated with search results and used by search_local().
         """
         self.http_client = http_client
         self.config = config or ApiConfig.default()
+        self.cache = cache
+        self.refresh = False  # Ignores cached responses, but still stores new ones
+        self.catalog = catalog
+        self._refreshing: Set[str] = set()
+        self._refreshing_lock = threading.Lock()
 
     def _get_data(
-        self, endpoint: str, params: Optional[Dict[str, str]] = None
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, str]] = None,
+        family: Optional[str] = None,
+        hedge: bool = False,
     ) -> Optional[Any]:
         """
         Makes a GET request to the API and returns the response data.
 
+        Responses of cacheable endpoint families are served from the cache while
+        fresh. Stale responses are served immediately and refreshed in the background.
+
         Args:
             endpoint: API endpoint.
             params: Optional query parameters.
+            family: Optional endpoint family name used to look up cache TTL.
+            hedge: Whether to hedge the request if it is slower than usual.
 
         Returns:
             Response data if successful, None otherwise
         """
         url = build_url(self.BASE_URL, endpoint)
 
+        ttl = self.cache.get_ttl(family) if self.cache and family else 0
+        if not self.cache or ttl <= 0:
+            return self._fetch(url, params, family, hedge)
+
+        key = self._get_cache_key(url, params)
+        cached = None if self.refresh else self.cache.get(key)
+
+        if cached is not None:
+            age = time.time() - cached.stored_at
+            if age < ttl:
+                logger.debug(f"Response cache hit: {key}")
+                profiler.record_cache_hit(family)
+                return cached.data
+            if age < ttl + self.cache.config.response_stale_ttl:
+                logger.debug(f"Serving stale response, refreshing: {key}")
+                profiler.record_cache_hit(family)
+                self._refresh_in_background(key, url, params, family)
+                return cached.data
+
+        data = self._fetch(url, params, family, hedge)
+        if data:
+            self.cache.set(key, data)
+        elif cached is not None:
+            logger.warning("Request failed, using expired cached response")
+            return cached.data
+
+        return data
+
+    def _fetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        family: Optional[str] = None,
+        hedge: bool = False,
+    ) -> Optional[Any]:
+        """
+        Makes a GET request to the API bypassing the cache.
+
+        Args:
+            url: Request URL.
+            params: Optional query parameters.
+            family: Optional endpoint family name used in request metrics.
+            hedge: Whether to hedge the request if it is slower than usual.
+
+        Returns:
+            Response data if successful, None otherwise
+        """
         logger.debug(f"Making GET request to {url} with parameters: {params}")
-        return self.http_client.get(url, params=params, headers=self.HEADERS, timeout=self.config.timeout)
+        return self.http_client.get(
+            url,
+            params=params,
+            headers=self.HEADERS,
+            timeout=self.config.timeout,
+            endpoint=family,
+            hedge=hedge,
+        )
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        family: Optional[str] = None,
+    ) -> None:
+        """
+        Refreshes cached response in a background thread.
+
+        Args:
+            key: Cache key.
+            url: Request URL.
+            params: Optional query parameters.
+            family: Optional endpoint family name used in request metrics.
+        """
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                data = self._fetch(url, params, family)
+                if data and self.cache:
+                    self.cache.set(key, data)
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    @staticmethod
+    def _get_cache_key(url: str, params: Optional[Dict[str, str]] = None) -> str:
+        """
+        Builds cache key for the request.
+
+        Args:
+            url: Request URL.
+            params: Optional query parameters.
+
+        Returns:
+            Cache key.
+        """
+        return f"{url}?{json.dumps(params or {}, sort_keys=True)}"
 
     def _get_poster_url(self, poster: Optional[str]) -> str:
         """
@@ -63,6 +192,24 @@ class AnimeAPI:
 
         return build_url(self.BASE_URL, f"api/uploads/images/{poster}")
 
+    @staticmethod
+    def _get_search_endpoint(query: str) -> Optional[str]:
+        """
+        Builds search endpoint for the query.
+
+        Args:
+            query: Search query.
+
+        Returns:
+            Endpoint if the query is valid, None otherwise.
+        """
+        encoded_query = normalize_query(query)
+        if not encoded_query:
+            logger.error("Search query is empty or contains invalid characters")
+            return None
+
+        return f"api/anime/search/{encoded_query}"
+
     def _parse_anime(self, data: Dict[str, Any]) -> Optional[Anime]:
         """
         Parses Anime data from the API response.
@@ -119,6 +266,72 @@ class AnimeAPI:
             logger.warning(f"Failed to parse fandub data: {error}")
             return None
 
+    def _parse_search_results(self, data: Optional[Any]) -> Optional[List[Anime]]:
+        """
+        Parses search response.
+
+        Args:
+            data: Response data.
+
+        Returns:
+            List of Anime objects if successful, None otherwise.
+        """
+        if not data or "result" not in data:
+            logger.error("API returned invalid data")
+            return None
+
+        return [anime for item in data["result"] if (anime := self._parse_anime(item))]
+
+    @staticmethod
+    def _parse_episodes(data: Optional[Any]) -> Optional[List[Episode]]:
+        """
+        Parses episodes response.
+
+        Args:
+            data: Response data.
+
+        Returns:
+            List of Episode objects if successful, None otherwise.
+        """
+        if not data:
+            logger.error("API returned invalid data")
+            return None
+
+        return [Episode(id_=item["id"], episode=item["episode"]) for item in data]
+
+    @staticmethod
+    def _parse_video_url(data: Optional[Any]) -> Optional[str]:
+        """
+        Parses episode response.
+
+        Args:
+            data: Response data.
+
+        Returns:
+            Video URL if successful, None otherwise.
+        """
+        if not data or "videoUrl" not in data:
+            logger.error("API returned invalid data")
+            return None
+
+        return data["videoUrl"]
+
+    def _parse_fandubs(self, data: Optional[Any]) -> Optional[List[Fandub]]:
+        """
+        Parses fandubs response.
+
+        Args:
+            data: Response data.
+
+        Returns:
+            List of Fandub objects if successful, None otherwise.
+        """
+        if not data:
+            logger.error("API returned invalid data")
+            return None
+
+        return [fandub for item in data if (fandub := self._parse_fandub(item))]
+
     def search(self, query: str) -> Optional[List[Anime]]:
         """
         Searches for anime by query.
@@ -131,20 +344,118 @@ class AnimeAPI:
         """
         logger.info(f"Searching anime with query: {query}")
 
-        encoded_query = normalize_query(query)
-        if not encoded_query:
-            logger.error("Search query is empty or contains invalid characters")
+        endpoint = self._get_search_endpoint(query)
+        if not endpoint:
             return None
 
-        endpoint = f"api/anime/search/{encoded_query}"
-        params = {"full": "true"}
-        data = self._get_data(endpoint, params)
+        data = self._get_data(endpoint, self.SEARCH_PARAMS, family="search")
+        results = self._parse_search_results(data)
+        if results and self.catalog:
+            self.catalog.add(results)
 
-        if not data or "result" not in data:
-            logger.error("API returned invalid data")
+        return results
+
+    def search_local(self, query: str) -> Optional[List[Anime]]:
+        """
+        Searches anime in the local catalog and refreshes it in the background.
+
+        Args:
+            query: Search query.
+
+        Returns:
+            List of Anime objects if the catalog has matches, None otherwise.
+        """
+        if not self.catalog:
             return None
 
-        return [anime for item in data["result"] if (anime := self._parse_anime(item))]
+        results = self.catalog.search(query)
+        if not results:
+            return None
+
+        logger.debug(f"Found {len(results)} anime in local catalog, refreshing")
+
+        key = f"catalog:{query}"
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return results
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self.search(query)
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+        return results
+
+    def iter_search(self, query: str) -> Generator[Anime, None, None]:
+        """
+        Searches for anime by query, yielding results as the response arrives.
+
+        Results are parsed one by one while the response body is still being
+        downloaded, so the first results are available before the whole body
+        is received. Cached responses are served like in search().
+
+        Args:
+            query: Search query.
+
+        Yields:
+            Anime objects in the order returned by the API.
+        """
+        logger.info(f"Searching anime with query (streaming): {query}")
+
+        endpoint = self._get_search_endpoint(query)
+        if not endpoint:
+            return
+
+        url = build_url(self.BASE_URL, endpoint)
+        key = self._get_cache_key(url, self.SEARCH_PARAMS)
+        ttl = self.cache.get_ttl("search") if self.cache else 0
+        cached = None
+        if self.cache and ttl > 0 and not self.refresh:
+            cached = self.cache.get(key)
+
+        # Fresh and stale cached responses are handled by the regular path
+        if self.cache and cached is not None:
+            age = time.time() - cached.stored_at
+            if age < ttl + self.cache.config.response_stale_ttl:
+                yield from self.search(query) or []
+                return
+
+        chunks = self.http_client.stream(
+            url,
+            params=self.SEARCH_PARAMS,
+            headers=self.HEADERS,
+            timeout=self.config.timeout,
+            endpoint="search",
+        )
+        if chunks is None:
+            if cached is not None:
+                logger.warning("Request failed, using expired cached response")
+                yield from self._parse_search_results(cached.data) or []
+            return
+
+        items = []
+        results = []
+        try:
+            for item in iter_array_items(chunks, "result"):
+                items.append(item)
+                if anime := self._parse_anime(item):
+                    results.append(anime)
+                    yield anime
+        except ValueError as error:
+            logger.error(f"API returned invalid data: {error}")
+            return
+        finally:
+            chunks.close()
+
+        if self.cache and ttl > 0:
+            self.cache.set(key, {"result": items})
+        if self.catalog:
+            self.catalog.add(results)
 
     def get_episodes(self, player_id: int, fandub_id: int) -> Optional[List[Episode]]:
         """
@@ -158,13 +469,8 @@ class AnimeAPI:
             List of Episode objects if successful, None otherwise.
         """
         endpoint = f"api/player/episodes/{player_id}/{fandub_id}"
-        data = self._get_data(endpoint)
-
-        if not data:
-            logger.error("API returned invalid data")
-            return None
-
-        return [Episode(id_=item["id"], episode=item["episode"]) for item in data]
+        data = self._get_data(endpoint, family="episodes")
+        return self._parse_episodes(data)
 
     def get_video_url(self, episode_id: int) -> Optional[str]:
         """
@@ -177,13 +483,61 @@ class AnimeAPI:
             Video URL if successful, None otherwise.
         """
         endpoint = f"api/player/episode/{episode_id}"
-        data = self._get_data(endpoint)
+        # Playback waits for this request, so its slow tail is hedged
+        data = self._get_data(endpoint, family="episode", hedge=True)
+        return self._parse_video_url(data)
 
-        if not data or "videoUrl" not in data:
-            logger.error("API returned invalid data")
-            return None
+    def iter_video_urls(
+        self, episode_ids: List[int], max_workers: Optional[int] = None
+    ) -> Iterator[Optional[str]]:
+        """
+        Resolves video URLs for the specified episodes concurrently and yields them in order.
 
-        return data["videoUrl"]
+        Each URL is yielded as soon as it and all preceding URLs are resolved, so
+        consumers can start using the first episodes while the rest are still pending.
+
+        Args:
+            episode_ids: List of episode IDs.
+            max_workers: Optional maximum number of concurrent requests. If not provided, value from configuration will be used.
+
+        Yields:
+            Video URLs in the same order as episode IDs. Failed episodes are represented by None.
+        """
+        if not episode_ids:
+            return
+
+        workers = min(max_workers or self.config.max_workers, len(episode_ids))
+        logger.debug(f"Resolving {len(episode_ids)} video URLs with {workers} workers")
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                executor.submit(self.get_video_url, episode_id)
+                for episode_id in episode_ids
+            ]
+            for episode_id, future in zip(episode_ids, futures):
+                url = future.result()
+                if url is None:
+                    logger.warning(f"Failed to get video URL for episode {episode_id}")
+                yield url
+        finally:
+            # Stops pending requests if the consumer stopped early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_video_urls(
+        self, episode_ids: List[int], max_workers: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Gets video URLs for the specified episodes concurrently.
+
+        Args:
+            episode_ids: List of episode IDs.
+            max_workers: Optional maximum number of concurrent requests. If not provided, value from configuration will be used.
+
+        Returns:
+            List of video URLs in the same order as episode IDs. Failed episodes are represented by None.
+        """
+        return list(self.iter_video_urls(episode_ids, max_workers))
 
     def get_fandubs_and_players(self, anime_id: int) -> Optional[List[Fandub]]:
         """
@@ -196,10 +550,5 @@ class AnimeAPI:
             List of Fandub objects if successful, None otherwise
         """
         endpoint = f"api/player/fundubs/{anime_id}"
-        data = self._get_data(endpoint)
-
-        if not data:
-            logger.error("API returned invalid data")
-            return None
-
-        return [fandub for item in data if (fandub := self._parse_fandub(item))]
+        data = self._get_data(endpoint, family="fandubs")
+        return self._parse_fandubs(data)
@@ -0,0 +1,465 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from animeon.config import CacheConfig
+from animeon.utils import get_cache_dir
+from animeon.utils.profiling import profiler
+
+from .http import HTTPClient
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Size-bounded on-disk cache with LRU eviction.
+
+    Entries are stored as separate files named by the hash of their key, so
+    several CLI instances can share one directory. Files are replaced
+    atomically and an entry removed by another process is treated as a miss.
+    """
+
+    DATA_SUFFIX = ".bin"
+    METADATA_SUFFIX = ".json"
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            directory: Directory for cache files.
+            max_size: Maximum total size of cached data in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    def _path(self, key: str, suffix: str) -> str:
+        """
+        Builds path of the cache file for the key.
+
+        Args:
+            key: Cache key.
+            suffix: File suffix.
+
+        Returns:
+            Path to the cache file.
+        """
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}{suffix}")
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """
+        Writes data to the file atomically.
+
+        Args:
+            path: Path to the file.
+            data: Data to write.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=".tmp-", delete=False
+        ) as file:
+            file.write(data)
+        os.replace(file.name, path)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Gets cached data and marks the entry as recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached data if present, None otherwise.
+        """
+        path = self._path(key, self.DATA_SUFFIX)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except OSError:
+            return None
+
+        return data
+
+    def get_metadata(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets metadata of the cached entry.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Metadata dictionary if present, None otherwise.
+        """
+        try:
+            with open(self._path(key, self.METADATA_SUFFIX), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def put(
+        self, key: str, data: bytes, metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Stores data in the cache and evicts old entries if the size limit is exceeded.
+
+        Args:
+            key: Cache key.
+            data: Data to store.
+            metadata: Optional metadata to store with the entry.
+        """
+        try:
+            self._write_atomic(self._path(key, self.DATA_SUFFIX), data)
+            if metadata is not None:
+                self.put_metadata(key, metadata)
+        except OSError as error:
+            logger.warning(f"Failed to write cache entry: {error}")
+            return
+
+        self.evict()
+
+    def put_metadata(self, key: str, metadata: Dict[str, Any]) -> None:
+        """
+        Stores metadata of the cached entry.
+
+        Args:
+            key: Cache key.
+            metadata: Metadata to store.
+        """
+        try:
+            self._write_atomic(
+                self._path(key, self.METADATA_SUFFIX), json.dumps(metadata).encode()
+            )
+        except OSError as error:
+            logger.warning(f"Failed to write cache metadata: {error}")
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits its size limit."""
+        entries = []
+        total_size = 0
+        try:
+            with os.scandir(self.directory) as iterator:
+                for entry in iterator:
+                    if not entry.name.endswith(self.DATA_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+        except OSError:
+            return
+
+        if total_size <= self.max_size:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+
+            logger.debug(f"Evicting cache entry: {path}")
+            metadata_path = path[: -len(self.DATA_SUFFIX)] + self.METADATA_SUFFIX
+            for file_path in (path, metadata_path):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass  # Already removed by another process
+            total_size -= size
+
+
+class PosterCache:
+    """
+    Cache of poster images.
+
+    Fresh posters are served from disk without any request. Stale posters
+    are revalidated with ETag/Last-Modified, and used as a fallback when the
+    server is unavailable.
+    """
+
+    def __init__(
+        self,
+        http_client: HTTPClient,
+        config: Optional[CacheConfig] = None,
+        cache: Optional[DiskCache] = None,
+    ) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            http_client: HTTP client for making requests.
+            config: Optional cache configuration. If not provided, default configuration will be used.
+            cache: Optional storage for posters. If not provided, a cache in the user cache directory will be used.
+        """
+        self.http_client = http_client
+        self.config = config or CacheConfig.default()
+        self.cache = cache or DiskCache(
+            get_cache_dir("posters"), self.config.poster_max_size
+        )
+
+    def get(self, url: str, timeout: Optional[int] = None) -> Optional[bytes]:
+        """
+        Gets poster image, using the cache when possible.
+
+        Args:
+            url: URL of the poster.
+            timeout: Optional request timeout in seconds.
+
+        Returns:
+            Poster content if successful, None otherwise.
+        """
+        metadata = self.cache.get_metadata(url) or {}
+        data = self.cache.get(url)
+
+        if data is not None:
+            age = time.time() - metadata.get("fetched_at", 0)
+            if age < self.config.poster_max_age:
+                logger.debug(f"Poster cache hit: {url}")
+                profiler.record_cache_hit("poster")
+                return data
+
+        headers: Dict[str, str] = {}
+        if data is not None:
+            if etag := metadata.get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := metadata.get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+
+        response = self.http_client.get_response(
+            url, headers=headers, timeout=timeout, endpoint="poster"
+        )
+        if response is None:
+            if data is not None:
+                logger.debug(f"Using stale cached poster: {url}")
+            return data
+
+        if response.status_code == 304 and data is not None:
+            logger.debug(f"Cached poster is still valid: {url}")
+            self.cache.put_metadata(url, {**metadata, "fetched_at": time.time()})
+            return data
+
+        content = response.content
+        self.cache.put(
+            url,
+            content,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            },
+        )
+
+        return content
+
+
+@dataclass(slots=True, frozen=True)
+class CachedResponse:
+    """
+    Cached API response.
+
+    Attributes:
+        data: Decoded response data.
+        stored_at: Unix timestamp when the response was stored.
+    """
+
+    data: Any
+    stored_at: float
+
+
+class ResponseCache(ABC):
+    """Abstract cache of decoded API responses."""
+
+    def __init__(self, config: Optional[CacheConfig] = None) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            config: Optional cache configuration. If not provided, default configuration will be used.
+        """
+        self.config = config or CacheConfig.default()
+
+    def get_ttl(self, family: str) -> int:
+        """
+        Gets time to live of responses from the endpoint family.
+
+        Args:
+            family: Endpoint family name.
+
+        Returns:
+            Time to live in seconds. Zero disables caching.
+        """
+        return self.config.response_ttls.get(family, 0)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Gets cached response.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached response if present, None otherwise.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, data: Any) -> None:
+        """
+        Stores response data.
+
+        Args:
+            key: Cache key.
+            data: Decoded response data.
+        """
+        pass
+
+    def close(self) -> None:
+        """Releases resources held by the cache."""
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """Response cache kept in process memory."""
+
+    def __init__(self, config: Optional[CacheConfig] = None) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            config: Optional cache configuration. If not provided, default configuration will be used.
+        """
+        super().__init__(config)
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Gets cached response from memory."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, data: Any) -> None:
+        """Stores response data in memory."""
+        with self._lock:
+            self._entries[key] = CachedResponse(data=data, stored_at=time.time())
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Response cache stored in SQLite database shared between runs.
+
+    Responses older than the longest time to live plus the stale period are
+    purged when the database is opened. Once closed, the cache stays closed:
+    background refreshes that finish later are dropped instead of reopening
+    the database.
+    """
+
+    def __init__(
+        self, config: Optional[CacheConfig] = None, path: Optional[str] = None
+    ) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            config: Optional cache configuration. If not provided, default configuration will be used.
+            path: Optional path to the database. If not provided, a file in the user cache directory will be used.
+        """
+        super().__init__(config)
+        self.path = path or get_cache_dir("responses.sqlite3")
+        self._connection: Optional[sqlite3.Connection] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """
+        Opens the database on first use. Must be called with the lock held.
+
+        Returns:
+            Database connection, or None if the cache was closed.
+        """
+        if self._closed:
+            return None
+
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, data TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._connection = connection
+            self._purge_expired(connection)
+
+        return self._connection
+
+    def _purge_expired(self, connection: sqlite3.Connection) -> None:
+        """
+        Removes responses that are too old to be served even as stale.
+
+        Args:
+            connection: Database connection.
+        """
+        max_age = max(self.config.response_ttls.values(), default=0)
+        max_age += self.config.response_stale_ttl
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM responses WHERE stored_at < ?", (time.time() - max_age,)
+            )
+        if cursor.rowcount > 0:
+            logger.debug(f"Purged {cursor.rowcount} expired cached responses")
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Gets cached response from the database."""
+        try:
+            with self._lock:
+                connection = self._connect()
+                if connection is None:
+                    return None
+                row = connection.execute(
+                    "SELECT data, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to read response cache: {error}")
+            return None
+
+        if row is None:
+            return None
+
+        return CachedResponse(data=json.loads(row[0]), stored_at=row[1])
+
+    def set(self, key: str, data: Any) -> None:
+        """Stores response data in the database."""
+        try:
+            with self._lock:
+                connection = self._connect()
+                if connection is None:
+                    logger.debug(f"Response cache is closed, dropping {key}")
+                    return
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                        (key, json.dumps(data, ensure_ascii=False), time.time()),
+                    )
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to write response cache: {error}")
+
+    def close(self) -> None:
+        """Closes the database connection. Later reads miss and writes are dropped."""
+        with self._lock:
+            self._closed = True
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,227 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Set
+
+from animeon.config import CatalogConfig
+from animeon.models import Anime
+from animeon.utils import get_cache_dir, transliterate
+
+logger = logging.getLogger(__name__)
+
+
+def _trigrams(text: str) -> Set[str]:
+    """
+    Splits normalized text into trigrams.
+
+    Args:
+        text: Normalized text.
+
+    Returns:
+        Set of trigrams.
+    """
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+class AnimeCatalog:
+    """
+    Local searchable index of anime seen in API responses.
+
+    Titles are transliterated to Latin and indexed by trigrams with SQLite
+    FTS5, so queries match regardless of script and tolerate typos. Once
+    closed, the catalog stays closed, so background refreshes that finish
+    later do not reopen the database.
+    """
+
+    def __init__(
+        self, config: Optional[CatalogConfig] = None, path: Optional[str] = None
+    ) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            config: Optional catalog configuration. If not provided, default configuration will be used.
+            path: Optional path to the database. If not provided, a file in the user cache directory will be used.
+        """
+        self.config = config or CatalogConfig.default()
+        self.path = path or get_cache_dir("catalog.sqlite3")
+        self._connection: Optional[sqlite3.Connection] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        """
+        Opens the database and creates its tables.
+
+        Returns:
+            Database connection.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS anime ("
+                "id INTEGER PRIMARY KEY, title TEXT NOT NULL, mal_id INTEGER, "
+                "year INTEGER, type TEXT, status TEXT, data TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            # Fails if SQLite is built without FTS5 or is older than 3.34
+            connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS anime_index "
+                "USING fts5(title, tokenize='trigram')"
+            )
+        except sqlite3.Error:
+            connection.close()
+            raise
+
+        return connection
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """
+        Opens the database on first use. Must be called with the lock held.
+
+        If the database cannot be opened, the catalog is closed, so callers
+        fall back to the API instead of retrying on every call.
+
+        Returns:
+            Database connection, or None if the catalog is closed.
+        """
+        if self._closed:
+            return None
+
+        if self._connection is None:
+            try:
+                self._connection = self._open()
+            except (OSError, sqlite3.Error) as error:
+                logger.warning(f"Anime catalog is unavailable: {error}")
+                self._closed = True
+                return None
+
+        return self._connection
+
+    def add(self, anime_list: Iterable[Anime]) -> None:
+        """
+        Adds or updates anime in the catalog.
+
+        Args:
+            anime_list: Anime to store.
+        """
+        now = time.time()
+        rows = [
+            (
+                anime.id_,
+                anime.title,
+                anime.mal_id,
+                anime.release_year,
+                anime.type_,
+                anime.status,
+                json.dumps(anime.to_dict(), ensure_ascii=False),
+                now,
+            )
+            for anime in anime_list
+        ]
+        if not rows:
+            return
+
+        try:
+            with self._lock:
+                connection = self._connect()
+                if connection is None:
+                    logger.debug("Anime catalog is closed, dropping update")
+                    return
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO anime VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    connection.executemany(
+                        "DELETE FROM anime_index WHERE rowid = ?",
+                        [(row[0],) for row in rows],
+                    )
+                    connection.executemany(
+                        "INSERT INTO anime_index (rowid, title) VALUES (?, ?)",
+                        [(row[0], transliterate(row[1])) for row in rows],
+                    )
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to update anime catalog: {error}")
+
+    def search(self, query: str) -> List[Anime]:
+        """
+        Searches anime by title.
+
+        Candidates sharing any trigram with the query are ranked by the share
+        of query trigrams their title contains, so small typos still match.
+
+        Args:
+            query: Search query in any script.
+
+        Returns:
+            Matching anime, best matches first.
+        """
+        normalized = transliterate(query)
+        query_trigrams = _trigrams(normalized)
+        if not query_trigrams:
+            return []
+
+        match = " OR ".join(
+            '"{}"'.format(trigram.replace('"', '""')) for trigram in query_trigrams
+        )
+        try:
+            with self._lock:
+                connection = self._connect()
+                if connection is None:
+                    return []
+                rows = connection.execute(
+                    "SELECT anime.data, anime_index.title FROM anime_index "
+                    "JOIN anime ON anime.id = anime_index.rowid "
+                    "WHERE anime_index MATCH ? ORDER BY rank LIMIT ?",
+                    (match, self.config.max_results * 10),
+                ).fetchall()
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to search anime catalog: {error}")
+            return []
+
+        scored = []
+        for data, title in rows:
+            score = len(query_trigrams & _trigrams(title)) / len(query_trigrams)
+            if normalized in title:
+                score += 1  # Exact substring matches go first
+            if score >= self.config.min_score:
+                scored.append((score, data))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            Anime.from_dict(json.loads(data))
+            for _, data in scored[: self.config.max_results]
+        ]
+
+    def count(self) -> int:
+        """
+        Counts anime in the catalog.
+
+        Returns:
+            Number of stored anime.
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                if connection is None:
+                    return 0
+                row = connection.execute("SELECT COUNT(*) FROM anime").fetchone()
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to read anime catalog: {error}")
+            return 0
+
+        return row[0]
+
+    def close(self) -> None:
+        """Closes the database connection. Later updates are dropped."""
+        with self._lock:
+            self._closed = True
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,280 @@
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index.json"
+# Headers describing the transfer, not the content, are not replayed
+SKIPPED_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+}
+
+
+def load_fixtures(path: str) -> Tuple[List[Dict[str, Any]], List[bytes]]:
+    """
+    Loads recorded requests from the fixture archive.
+
+    Args:
+        path: Path to the archive.
+
+    Returns:
+        List of entries and list of their bodies.
+    """
+    with zipfile.ZipFile(path) as archive:
+        entries = json.loads(archive.read(INDEX_NAME))
+        bodies = [archive.read(entry["body"]) for entry in entries]
+
+    return entries, bodies
+
+
+class RecordingStream:
+    """
+    Raw response stream that passes the body on once it is fully read.
+
+    The body is collected while the client reads it, so streamed responses
+    are still consumed incrementally. Responses closed before their body is
+    read to the end are not passed on.
+    """
+
+    def __init__(self, raw: Any, on_complete: Callable[[bytes], None]) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            raw: Raw urllib3 response.
+            on_complete: Callback receiving the decoded body.
+        """
+        self._raw = raw
+        self._on_complete = on_complete
+
+    def stream(
+        self, amt: Optional[int] = 2**16, decode_content: Optional[bool] = None
+    ) -> Iterator[bytes]:
+        """
+        Yields chunks of the body and collects them.
+
+        Args:
+            amt: Maximum size of a chunk in bytes.
+            decode_content: Whether to decode the body according to Content-Encoding.
+
+        Yields:
+            Body chunks.
+        """
+        chunks = []
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            chunks.append(chunk)
+            yield chunk
+
+        self._on_complete(b"".join(chunks))
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegates other attributes to the raw response."""
+        return getattr(self._raw, name)
+
+
+class FixtureRecorder:
+    """
+    Records HTTP responses into a fixture archive.
+
+    Several processes may record into one archive: saving merges with the
+    responses already stored under an exclusive lock on a sidecar file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            path: Path to the archive. Responses recorded earlier are kept.
+        """
+        self.path = path
+        self._entries: List[Dict[str, Any]] = []
+        self._bodies: List[bytes] = []
+        self._lock = threading.Lock()
+
+    def record(self, response: requests.Response, *args: Any, **kwargs: Any) -> None:
+        """
+        Records response once its body is read. Used as requests response hook.
+
+        Args:
+            response: Received response.
+            args: Other hook arguments.
+            kwargs: Other hook keyword arguments.
+        """
+        entry = {
+            "method": response.request.method,
+            "url": response.request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in SKIPPED_HEADERS
+            },
+            "elapsed": response.elapsed.total_seconds(),
+        }
+
+        def add(body: bytes) -> None:
+            with self._lock:
+                self._entries.append(entry)
+                self._bodies.append(body)
+
+        # Reading the content here would buffer streamed responses
+        response.raw = RecordingStream(response.raw, add)
+
+    def save(self) -> None:
+        """Writes recorded responses to the archive."""
+        with self._lock:
+            entries = list(self._entries)
+            bodies = list(self._bodies)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(f"{self.path}.lock", "a") as lock_file:
+                # Held until the archive is replaced, so no process loses entries
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                entries, bodies = self._merge(entries, bodies)
+                self._write(directory, entries, bodies)
+        except OSError as error:
+            logger.error(f"Failed to save fixture archive: {error}")
+            return
+
+        logger.debug(f"Saved {len(entries)} recorded responses to {self.path}")
+
+    def _merge(
+        self, entries: List[Dict[str, Any]], bodies: List[bytes]
+    ) -> Tuple[List[Dict[str, Any]], List[bytes]]:
+        """
+        Prepends responses already stored in the archive.
+
+        Args:
+            entries: Recorded entries.
+            bodies: Bodies of the recorded entries.
+
+        Returns:
+            Merged list of entries and list of their bodies.
+        """
+        if not os.path.exists(self.path):
+            return entries, bodies
+
+        try:
+            old_entries, old_bodies = load_fixtures(self.path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as error:
+            logger.warning(f"Overwriting unreadable fixture archive: {error}")
+            return entries, bodies
+
+        return old_entries + entries, old_bodies + bodies
+
+    def _write(
+        self, directory: str, entries: List[Dict[str, Any]], bodies: List[bytes]
+    ) -> None:
+        """
+        Replaces the archive atomically.
+
+        Args:
+            directory: Directory of the archive.
+            entries: Entries to store.
+            bodies: Bodies of the entries.
+        """
+        with tempfile.NamedTemporaryFile(
+            dir=directory, prefix=".tmp-", delete=False
+        ) as file:
+            with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as archive:
+                for index, (entry, body) in enumerate(zip(entries, bodies)):
+                    entry["body"] = f"bodies/{index}"
+                    archive.writestr(entry["body"], body)
+                index = json.dumps(entries, ensure_ascii=False)
+                archive.writestr(INDEX_NAME, index)
+        os.replace(file.name, self.path)
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter serving responses from a fixture archive."""
+
+    def __init__(self, path: str, time_scale: float = 1.0) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            path: Path to the archive.
+            time_scale: Multiplier for recorded response times. Zero replays instantly.
+        """
+        super().__init__()
+        self.time_scale = time_scale
+        self._responses: Dict[Tuple[str, str], List[Tuple[Dict[str, Any], bytes]]] = (
+            defaultdict(list)
+        )
+        self._lock = threading.Lock()
+
+        entries, bodies = load_fixtures(path)
+        for entry, body in zip(entries, bodies):
+            self._responses[(entry["method"], entry["url"])].append((entry, body))
+
+        logger.debug(f"Loaded {len(entries)} recorded responses from {path}")
+
+    def send(
+        self, request: requests.PreparedRequest, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        """
+        Returns recorded response for the request.
+
+        Repeated requests get recorded responses in order; the last one is
+        reused once the others are consumed.
+
+        Args:
+            request: Prepared request.
+            args: Other adapter arguments.
+            kwargs: Other adapter keyword arguments.
+
+        Returns:
+            Recorded response.
+
+        Raises:
+            ConnectionError: If there is no recorded response for the request.
+        """
+        key = (request.method or "GET", request.url or "")
+        with self._lock:
+            recorded = self._responses.get(key)
+            if not recorded:
+                raise requests.exceptions.ConnectionError(
+                    f"No recorded response for {request.method} {request.url}",
+                    request=request,
+                )
+            entry, body = recorded.pop(0) if len(recorded) > 1 else recorded[0]
+
+        if self.time_scale > 0:
+            time.sleep(entry["elapsed"] * self.time_scale)
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = request.url or ""
+        response.request = request
+        response.elapsed = timedelta(seconds=entry["elapsed"])
+        response._content = body
+        response._content_consumed = True  # Streaming reads the body from memory
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+
+        return response
+
+    def close(self) -> None:
+        """Releases resources held by the adapter."""
+        pass
@@ -1,65 +1,629 @@
 import logging
-from typing import Any, Dict, Optional
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Deque, Dict, Generator, List, Optional, Type
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from animeon.config import HttpConfig
+from animeon.utils.profiling import profiler
+
+from .rate_limit import RateLimiter, shared_rate_limiter
+
+if TYPE_CHECKING:
+    from .fixtures import FixtureRecorder
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class ConnectionStats:
+    """
+    Connection pool statistics.
+
+    Attributes:
+        opened: Number of new connections opened.
+        reused: Number of requests served by already opened connections.
+    """
+
+    opened: int
+    reused: int
+
+
+@dataclass(slots=True, frozen=True)
+class RequestStats:
+    """
+    Statistics of retried and hedged requests.
+
+    Attributes:
+        retries: Number of retries after transient failures.
+        hedged: Number of hedged requests sent because a request was slow.
+        hedge_wins: Number of hedged requests that answered first.
+    """
+
+    retries: int
+    hedged: int
+    hedge_wins: int
+
+
 class HTTPClient:
-    """Client for making HTTP requests."""
+    """
+    Client for making HTTP requests.
+
+    GET requests are idempotent, so they are retried with exponential backoff
+    on connection errors, timeouts, 429 and 5xx responses. Latency-sensitive
+    requests can be hedged: if the response does not arrive within the usual
+    latency of the endpoint, a second request is sent and the first answer wins.
+    All attempts pass through a rate limiter that is shared by default.
+    """
 
-    def __init__(self) -> None:
-        """Initializes the class."""
+    # Number of recent latencies per endpoint used to estimate its quantile
+    LATENCY_WINDOW = 100
+
+    def __init__(
+        self,
+        config: Optional[HttpConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            config: Optional HTTP configuration. If not provided, default configuration will be used.
+            rate_limiter: Optional rate limiter. If not provided, the limiter shared by all clients will be used.
+        """
+        self.config = config or HttpConfig.default()
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self._adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+        )
         self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
 
-    def get(
+        self._recorder: Optional["FixtureRecorder"] = None
+        if self.config.replay_path:
+            logger.debug(f"Replaying HTTP responses from {self.config.replay_path}")
+            from .fixtures import ReplayAdapter
+
+            replay_adapter = ReplayAdapter(
+                self.config.replay_path, self.config.replay_time_scale
+            )
+            self._session.mount("https://", replay_adapter)
+            self._session.mount("http://", replay_adapter)
+        elif self.config.record_path:
+            logger.debug(f"Recording HTTP responses to {self.config.record_path}")
+            from .fixtures import FixtureRecorder
+
+            self._recorder = FixtureRecorder(self.config.record_path)
+            self._session.hooks["response"].append(self._recorder.record)
+
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._retries = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._stats_lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        # Releases rate limiter slots held by open streamed responses
+        self._stream_slots: "weakref.WeakKeyDictionary[requests.Response, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def __enter__(self) -> "HTTPClient":
+        """Returns the client for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Closes the client when leaving the context."""
+        self.close()
+
+    def close(self) -> None:
+        """Closes all pooled connections and saves recorded responses."""
+        if self._recorder:
+            self._recorder.save()
+            self._recorder = None
+
+        with self._stats_lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        stats = self.get_connection_stats()
+        request_stats = self.get_request_stats()
+        logger.debug(
+            f"Closing HTTP session (connections opened: {stats.opened}, "
+            f"reused: {stats.reused}, retries: {request_stats.retries}, "
+            f"hedged: {request_stats.hedged}, won: {request_stats.hedge_wins})"
+        )
+        self._session.close()
+
+    def get_connection_stats(self) -> ConnectionStats:
+        """
+        Collects statistics from the connection pools.
+
+        Returns:
+            Numbers of opened and reused connections.
+        """
+        opened = 0
+        requests_count = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:  # Pool was evicted in the meantime
+                continue
+            opened += pool.num_connections
+            requests_count += pool.num_requests
+
+        return ConnectionStats(opened=opened, reused=max(requests_count - opened, 0))
+
+    def get_request_stats(self) -> RequestStats:
+        """
+        Collects statistics of retried and hedged requests.
+
+        Returns:
+            Numbers of retries, hedged requests and hedged requests that won.
+        """
+        with self._stats_lock:
+            return RequestStats(
+                retries=self._retries,
+                hedged=self._hedged,
+                hedge_wins=self._hedge_wins,
+            )
+
+    @staticmethod
+    def _is_retryable_status(status_code: int) -> bool:
+        """Checks whether the response status indicates a transient failure."""
+        return status_code == 429 or status_code >= 500
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Calculates delay before a retry.
+
+        Args:
+            attempt: Number of the failed attempt, starting from zero.
+
+        Returns:
+            Delay in seconds. Full jitter spreads out retries of concurrent requests.
+        """
+        delay = min(
+            self.config.retry_backoff * 2**attempt, self.config.retry_backoff_max
+        )
+        return random.uniform(0, delay)
+
+    def _record_latency(self, endpoint: str, latency: float) -> None:
+        """
+        Stores latency of a successful request.
+
+        Args:
+            endpoint: Endpoint name.
+            latency: Time until the response headers arrived, in seconds.
+        """
+        with self._stats_lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = deque(maxlen=self.LATENCY_WINDOW)
+                self._latencies[endpoint] = latencies
+            latencies.append(latency)
+
+    def _hedge_delay(self, endpoint: str) -> Optional[float]:
+        """
+        Calculates how long to wait before hedging a request to the endpoint.
+
+        Args:
+            endpoint: Endpoint name.
+
+        Returns:
+            Latency quantile of the endpoint in seconds, or None if hedging is
+            disabled or there are not enough samples yet.
+        """
+        quantile = self.config.hedge_quantile
+        if quantile is None:
+            return None
+
+        with self._stats_lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+        if len(latencies) < self.config.hedge_min_samples:
+            return None
+
+        return latencies[min(int(len(latencies) * quantile), len(latencies) - 1)]
+
+    def _send(
+        self,
+        url: str,
+        endpoint: str,
+        stream: bool = False,
+        retry: bool = True,
+        sent: Optional[threading.Event] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Makes a GET request, retrying transient failures.
+
+        Args:
+            url: URL to make the request to.
+            endpoint: Endpoint name for request metrics.
+            stream: Whether to defer downloading the response body.
+            retry: Whether to retry transient failures. If False, only one attempt is made.
+            sent: Optional event set when the first attempt passes the rate limiter.
+            kwargs: Other arguments for requests.Session.get().
+
+        Returns:
+            Response of the last attempt. Its status is not checked.
+
+        Raises:
+            requests.exceptions.ConnectionError: If the last attempt failed to connect.
+            requests.exceptions.Timeout: If the last attempt timed out.
+        """
+        host = urlsplit(url).netloc
+        max_retries = self.config.max_retries if retry else 0
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self._get(url, host, stream, sent, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as error:
+                if attempt >= max_retries:
+                    raise
+                reason = type(error).__name__
+            else:
+                self.rate_limiter.on_response(
+                    host, response.status_code, response.headers.get("Retry-After")
+                )
+                if (
+                    not self._is_retryable_status(response.status_code)
+                    or attempt >= max_retries
+                ):
+                    if response.ok:
+                        self._record_latency(endpoint, time.perf_counter() - start)
+                    return response
+                self._close(response)
+                reason = f"HTTP {response.status_code}"
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.warning(
+                f"Retrying request to {url} after {reason} in {delay:.2f}s "
+                f"({attempt}/{max_retries})"
+            )
+            with self._stats_lock:
+                self._retries += 1
+            profiler.record_retry(endpoint)
+            time.sleep(delay)
+
+    def _get(
+        self,
+        url: str,
+        host: str,
+        stream: bool,
+        sent: Optional[threading.Event] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Makes a single GET request within the rate limit.
+
+        A streamed response keeps its rate limiter slot until it is closed
+        with _close(), because its body is still being downloaded.
+
+        Args:
+            url: URL to make the request to.
+            host: Host name for rate limiting.
+            stream: Whether to defer downloading the response body.
+            sent: Optional event set once the request passes the rate limiter.
+            kwargs: Other arguments for requests.Session.get().
+
+        Returns:
+            Response of the request.
+        """
+        if not stream:
+            with self.rate_limiter.limit(host):
+                if sent:
+                    sent.set()
+                return self._session.get(url, **kwargs)
+
+        self.rate_limiter.acquire(host)
+        if sent:
+            sent.set()
+        try:
+            response = self._session.get(url, stream=True, **kwargs)
+        except BaseException:
+            self.rate_limiter.release()
+            raise
+
+        # Also fires if an abandoned response is garbage collected
+        release = weakref.finalize(response, self.rate_limiter.release)
+        with self._stats_lock:
+            self._stream_slots[response] = release
+        return response
+
+    def _close(self, response: requests.Response) -> None:
+        """
+        Closes response and frees its rate limiter slot if it is streamed.
+
+        Args:
+            response: Response to close.
+        """
+        response.close()
+        with self._stats_lock:
+            release = self._stream_slots.pop(response, None)
+        if release is not None:
+            release()
+
+    @staticmethod
+    def _discard(future: "Future[requests.Response]") -> None:
+        """Releases connection of a request whose response is not used."""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _send_hedged(self, url: str, endpoint: str, **kwargs: Any) -> requests.Response:
+        """
+        Makes a GET request and sends a second one if the first is slow.
+
+        Only the first request retries transient failures. The hedged request
+        is a single attempt, so hedging adds at most one request. The delay is
+        counted from the moment the first request passes the rate limiter, and
+        requests to a throttled host are not hedged, because waiting for the
+        rate limiter is not a slow response.
+
+        Args:
+            url: URL to make the request to.
+            endpoint: Endpoint name for request metrics.
+            kwargs: Other arguments for requests.Session.get().
+
+        Returns:
+            First successful response, or the last failed one.
+
+        Raises:
+            requests.exceptions.ConnectionError: If all attempts failed to connect.
+            requests.exceptions.Timeout: If all attempts timed out.
+        """
+        host = urlsplit(url).netloc
+        delay = self._hedge_delay(endpoint)
+        if delay is None or self.rate_limiter.is_throttled(host):
+            return self._send(url, endpoint, **kwargs)
+
+        with self._stats_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.config.pool_maxsize, thread_name_prefix="hedge"
+                )
+            executor = self._hedge_executor
+
+        sent = threading.Event()
+        futures: List[Future[requests.Response]] = [
+            executor.submit(self._send, url, endpoint, sent=sent, **kwargs)
+        ]
+        # Also wakes up if the request fails before it is sent
+        futures[0].add_done_callback(lambda _: sent.set())
+        sent.wait()
+
+        done, _ = wait(futures, timeout=delay)
+        if not done and not self.rate_limiter.is_throttled(host):
+            logger.debug(f"Hedging request to {url} after {delay * 1000:.0f} ms")
+            futures.append(
+                executor.submit(self._send, url, endpoint, retry=False, **kwargs)
+            )
+            with self._stats_lock:
+                self._hedged += 1
+            profiler.record_hedge(endpoint)
+
+        winner: Optional[Future[requests.Response]] = None
+        error: Optional[BaseException] = None
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is None:
+                winner = future
+                if future.result().ok:
+                    break
+
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(self._discard)
+
+        if winner is None:
+            raise error  # type: ignore
+
+        if winner is not futures[0]:
+            with self._stats_lock:
+                self._hedge_wins += 1
+
+        return winner.result()
+
+    def get_response(
         self,
         url: str,
         params: Optional[Dict[str, str]] = None,
         headers: Optional[Dict[str, str]] = None,
         timeout: Optional[int] = None,
-        as_json: bool = True,
-    ) -> Optional[Any]:
+        endpoint: Optional[str] = None,
+        hedge: bool = False,
+    ) -> Optional[requests.Response]:
         """
-        Makes a GET request to the specified URL.
+        Makes a GET request to the specified URL and returns the raw response.
 
         Args:
             url: URL to make the request to.
             params: Optional query parameters.
             headers: Optional request headers.
             timeout: Optional request timeout in seconds.
-            as_json: Whether to return response as JSON.
+            endpoint: Optional endpoint name for request metrics. Defaults to the host.
+            hedge: Whether to send a second request if the first one is slower than usual.
 
         Returns:
-            Response data as JSON dict or raw content if as_json is False.
+            Response object if successful, None otherwise.
+        """
+        endpoint = endpoint or urlsplit(url).netloc
+        start = time.perf_counter()
+        response = None
+        try:
+            logger.debug(f"Making GET request to {url}")
+            logger.debug(f"Parameters: {params}")
+            logger.debug(f"HTTP headers: {headers}")
+            logger.debug(f"Timeout: {timeout}")
 
-        Raises:
-            ConnectionError: If a connection error occurs.
-            Timeout: If the request times out.
-            HTTPError: If an HTTP error occurs.
-            JSONDecodeError: If the response is not JSON when as_json is True.
+            send = self._send_hedged if hedge else self._send
+            response = send(
+                url, endpoint, params=params, headers=headers, timeout=timeout
+            )
+            response.raise_for_status()
+
+            logger.debug(f"Server response: {response.status_code}")
+            profiler.record_request(endpoint, start, len(response.content))
+
+            return response
+        except requests.exceptions.ConnectionError as error:
+            logger.error(f"Connection error: {error}")
+        except requests.exceptions.Timeout as error:
+            logger.error(f"Request timed out: {error}")
+        except requests.exceptions.HTTPError as error:
+            logger.error(f"Failed to make request: {error}")
+
+        size = len(response.content) if response is not None else 0
+        profiler.record_request(endpoint, start, size, failed=True)
+        return None
+
+    def stream(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None,
+        endpoint: Optional[str] = None,
+        chunk_size: int = 16 * 1024,
+    ) -> Optional[Generator[bytes, None, None]]:
+        """
+        Makes a GET request to the specified URL and streams the response body.
+
+        Args:
+            url: URL to make the request to.
+            params: Optional query parameters.
+            headers: Optional request headers.
+            timeout: Optional request timeout in seconds.
+            endpoint: Optional endpoint name for request metrics. Defaults to the host.
+            chunk_size: Maximum size of each chunk in bytes.
+
+        Returns:
+            Generator of body chunks if the request succeeded, None otherwise.
+            The iterator stops early if the connection fails while reading.
         """
+        endpoint = endpoint or urlsplit(url).netloc
+        start = time.perf_counter()
         try:
-            with self._session as session:
-                logger.debug(f"Making GET request to {url}")
-                logger.debug(f"Parameters: {params}")
-                logger.debug(f"HTTP headers: {headers}")
-                logger.debug(f"Timeout: {timeout}")
-
-                response = session.get(
-                    url, params=params, headers=headers, timeout=timeout
-                )
-                response.raise_for_status()
+            logger.debug(f"Making streaming GET request to {url}")
+            logger.debug(f"Parameters: {params}")
 
-                logger.debug(f"Server response: {response.status_code}")
+            response = self._send(
+                url,
+                endpoint,
+                stream=True,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+            )
+            response.raise_for_status()
 
-                return response.json() if as_json else response.content
+            logger.debug(f"Server response: {response.status_code}")
         except requests.exceptions.ConnectionError as error:
             logger.error(f"Connection error: {error}")
         except requests.exceptions.Timeout as error:
             logger.error(f"Request timed out: {error}")
         except requests.exceptions.HTTPError as error:
+            self._close(response)
             logger.error(f"Failed to make request: {error}")
+        else:
+            return self._iter_chunks(response, endpoint, start, chunk_size)
+
+        profiler.record_request(endpoint, start, 0, failed=True)
+        return None
+
+    def _iter_chunks(
+        self,
+        response: requests.Response,
+        endpoint: str,
+        start: float,
+        chunk_size: int,
+    ) -> Generator[bytes, None, None]:
+        """
+        Reads body of the streamed response and releases its connection and slot.
+
+        Args:
+            response: Streamed response.
+            endpoint: Endpoint name for request metrics.
+            start: Request start time from time.perf_counter().
+            chunk_size: Maximum size of each chunk in bytes.
+
+        Yields:
+            Body chunks.
+        """
+        size = 0
+        failed = False
+        try:
+            for chunk in response.iter_content(chunk_size):
+                size += len(chunk)
+                yield chunk
+        except requests.exceptions.RequestException as error:
+            failed = True
+            logger.error(f"Failed to read response: {error}")
+        finally:
+            self._close(response)
+            profiler.record_request(endpoint, start, size, failed=failed)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None,
+        as_json: bool = True,
+        endpoint: Optional[str] = None,
+        hedge: bool = False,
+    ) -> Optional[Any]:
+        """
+        Makes a GET request to the specified URL.
+
+        Args:
+            url: URL to make the request to.
+            params: Optional query parameters.
+            headers: Optional request headers.
+            timeout: Optional request timeout in seconds.
+            as_json: Whether to return response as JSON.
+            endpoint: Optional endpoint name for request metrics. Defaults to the host.
+            hedge: Whether to send a second request if the first one is slower than usual.
+
+        Returns:
+            Response data as JSON dict or raw content if as_json is False.
+        """
+        response = self.get_response(
+            url,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            endpoint=endpoint,
+            hedge=hedge,
+        )
+        if response is None:
+            return None
+
+        try:
+            return response.json() if as_json else response.content
         except requests.exceptions.JSONDecodeError as error:
             logger.error(f"JSON decode error: {error}")
+            return None
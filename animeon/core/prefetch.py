@@ -0,0 +1,73 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Prefetcher:
+    """Runs requests speculatively in the background and hands over their results."""
+
+    def __init__(self, max_workers: int = 2) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            max_workers: Maximum number of concurrent background requests.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, function: Callable[..., Any], *args: Any) -> None:
+        """
+        Schedules a background call unless one with the same key already exists.
+
+        Args:
+            key: Key identifying the call.
+            function: Function to call.
+            args: Positional arguments for the function.
+        """
+        with self._lock:
+            if key in self._futures:
+                return
+
+            logger.debug(f"Prefetching {key}")
+            try:
+                self._futures[key] = self._executor.submit(function, *args)
+            except RuntimeError:  # Executor was shut down
+                pass
+
+    def get(self, key: Hashable, function: Callable[..., T], *args: Any) -> T:
+        """
+        Gets the result of a prefetched call, or makes the call if it was not prefetched.
+
+        Args:
+            key: Key identifying the call.
+            function: Function to call if the result is not prefetched.
+            args: Positional arguments for the function.
+
+        Returns:
+            Result of the call.
+        """
+        with self._lock:
+            future = self._futures.pop(key, None)
+
+        if future is not None and not future.cancelled():
+            try:
+                result = future.result()
+                logger.debug(f"Using prefetched result for {key}")
+                return result
+            except Exception as error:
+                logger.debug(f"Prefetch of {key} failed: {error}")
+
+        return function(*args)
+
+    def close(self) -> None:
+        """Cancels pending background calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
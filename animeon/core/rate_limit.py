@@ -0,0 +1,229 @@
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+
+from animeon.config import RateLimitConfig
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses Retry-After header.
+
+    Args:
+        value: Header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        Delay in seconds if the value is valid, None otherwise.
+    """
+    if not value:
+        return None
+
+    try:
+        delay = float(value)
+    except ValueError:
+        pass
+    else:
+        if math.isfinite(delay):
+            return max(delay, 0.0)
+        logger.debug(f"Invalid Retry-After header: {value}")
+        return None
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        logger.debug(f"Invalid Retry-After header: {value}")
+        return None
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """
+    Request budget of a single host.
+
+    Attributes:
+        rate: Current refill rate in tokens per second.
+        tokens: Number of available tokens.
+        updated_at: Time of the last refill from time.monotonic().
+        blocked_until: Time before which no requests are allowed, from time.monotonic().
+    """
+
+    rate: float
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter shared by concurrent callers.
+
+    Every host has a token bucket, and the number of requests in flight is
+    capped across all hosts. 429 responses halve the rate of the host and
+    block it for the Retry-After period; successful responses slowly restore
+    the rate. State is guarded by a lock that is never held while waiting.
+
+    The budget is kept in memory, so it is shared within one process only.
+    Helper processes started by fzf (live search, lazy previews) each have
+    their own limiter.
+    """
+
+    def __init__(self, config: Optional[RateLimitConfig] = None) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            config: Optional rate limiting configuration. If not provided, default configuration will be used.
+        """
+        self.config = config or RateLimitConfig.default()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+
+    def _take_token(self, host: str) -> float:
+        """
+        Takes a token from the bucket of the host if one is available.
+
+        Args:
+            host: Host name.
+
+        Returns:
+            Zero if a token was taken, otherwise delay until one is available in seconds.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    rate=self.config.rate, tokens=self.config.burst, updated_at=now
+                )
+                self._buckets[host] = bucket
+
+            if now < bucket.blocked_until:
+                return bucket.blocked_until - now
+
+            bucket.tokens = min(
+                bucket.tokens + (now - bucket.updated_at) * bucket.rate,
+                self.config.burst,
+            )
+            bucket.updated_at = now
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+
+            return (1 - bucket.tokens) / bucket.rate
+
+    def _try_enter(self) -> bool:
+        """
+        Takes an in-flight slot if one is free. Must be called with the lock held.
+
+        Returns:
+            True if a slot was taken, False otherwise.
+        """
+        if self._in_flight >= self.config.max_in_flight:
+            return False
+        self._in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Frees an in-flight slot taken by acquire() and wakes up waiters."""
+        with self._lock:
+            self._in_flight -= 1
+            self._slot_freed.notify()
+
+    def acquire(self, host: str) -> None:
+        """
+        Blocks until a request to the host is allowed and takes its slot.
+
+        The slot must be freed with release().
+
+        Args:
+            host: Host name.
+        """
+        while delay := self._take_token(host):
+            time.sleep(delay)
+
+        with self._lock:
+            while not self._try_enter():
+                self._slot_freed.wait()
+
+    @contextmanager
+    def limit(self, host: str) -> Iterator[None]:
+        """
+        Blocks until a request to the host is allowed and holds its slot.
+
+        Args:
+            host: Host name.
+        """
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def is_throttled(self, host: str) -> bool:
+        """
+        Checks whether requests to the host are slowed down after a 429 response.
+
+        Args:
+            host: Host name.
+
+        Returns:
+            True if the host is blocked or its rate is below the configured one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                return False
+            return now < bucket.blocked_until or bucket.rate < self.config.rate
+
+    def on_response(
+        self, host: str, status_code: int, retry_after: Optional[str] = None
+    ) -> None:
+        """
+        Adapts the rate of the host to the server response.
+
+        Args:
+            host: Host name.
+            status_code: HTTP status code of the response.
+            retry_after: Optional value of the Retry-After header.
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is not None:
+            delay = min(delay, self.config.max_retry_after)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                return
+
+            if status_code == 429:
+                bucket.rate = max(
+                    bucket.rate * self.config.decrease_factor, self.config.min_rate
+                )
+                bucket.tokens = 0
+                logger.warning(
+                    f"Rate limited by {host}, lowering rate to {bucket.rate:.2f}/s"
+                )
+            elif status_code < 400:
+                bucket.rate = min(
+                    bucket.rate + self.config.increase_step, self.config.rate
+                )
+
+            if delay is not None:
+                bucket.blocked_until = max(
+                    bucket.blocked_until, time.monotonic() + delay
+                )
+                logger.debug(f"Pausing requests to {host} for {delay:.2f}s")
+
+
+# Shared by all HTTP clients of the process, so concurrent callers draw from
+# one budget
+shared_rate_limiter = RateLimiter()
@@ -1,5 +1,10 @@
 import re
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional
+
+MARKDOWN_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\([^\)]+\)")
+ANGLE_LINK_PATTERN = re.compile(r"<(http[s]?://\S+)>")
 
 
 @dataclass(slots=True)
@@ -19,7 +24,7 @@ class Anime:
         status: Status of the anime.
         release_year: Year the anime was released.
         producer: Producer of the anime.
-        description: Description of the anime.
+        description: Raw description of the anime as returned by the API. See clean_description.
         mal_id: MyAnimeList ID of the anime.
     """
 
@@ -36,16 +41,59 @@ class Anime:
     producer: str
     description: str
     mal_id: int
+    _clean_description: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """
         Post initialization method.
         """
-        if self.description:
-            self.description = self._clean_text(self.description)
+        # Values repeated across search results share a single string object
+        for name in ("type_", "status", "producer"):
+            value = getattr(self, name)
+            if isinstance(value, str):
+                setattr(self, name, sys.intern(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts anime to a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary of constructor arguments.
+        """
+        return {
+            item.name: getattr(self, item.name) for item in fields(self) if item.init
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Anime":
+        """
+        Creates anime from a dictionary returned by to_dict().
+
+        Args:
+            data: Dictionary of constructor arguments.
+
+        Returns:
+            Anime object.
+        """
+        return cls(**data)
+
+    @property
+    def clean_description(self) -> str:
+        """
+        Description without Markdown links.
+
+        Cleaned on first access, because most descriptions are never shown.
+        """
+        if self._clean_description is None:
+            self._clean_description = (
+                self.clean_text(self.description) if self.description else ""
+            )
+        return self._clean_description
 
     @staticmethod
-    def _clean_text(text: str) -> str:
+    def clean_text(text: str) -> str:
         """
         Cleans text from Markdown links.
 
@@ -56,7 +104,9 @@ class Anime:
             Cleaned text.
         """
         # Removes Markdown links
-        text = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", text)
-        text = re.sub(r"<(http[s]?://\S+)>", r"\1", text)
+        if "](" in text:
+            text = MARKDOWN_LINK_PATTERN.sub(r"\1", text)
+        if "<http" in text:
+            text = ANGLE_LINK_PATTERN.sub(r"\1", text)
 
         return text.strip()
@@ -1,15 +1,34 @@
-from .cli import CLI
-from .commands import SearchCommand
-from .player import MpvPlayer
-from .preview import AnimePreviewGenerator
-from .prompt import Prompt
-from .selector import ContentSelector
+from typing import TYPE_CHECKING
+
+from animeon.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .cli import CLI
+    from .commands import SearchCommand
+    from .player import MpvPlayer
+    from .preview import AnimePreviewGenerator
+    from .prompt import PersistentPrompt, Prompt
+    from .selector import ContentSelector
 
 __all__ = [
     "CLI",
     "SearchCommand",
     "MpvPlayer",
     "AnimePreviewGenerator",
+    "PersistentPrompt",
     "Prompt",
     "ContentSelector",
 ]
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "CLI": ".cli",
+        "SearchCommand": ".commands",
+        "MpvPlayer": ".player",
+        "AnimePreviewGenerator": ".preview",
+        "PersistentPrompt": ".prompt",
+        "Prompt": ".prompt",
+        "ContentSelector": ".selector",
+    },
+)
@@ -1,6 +1,8 @@
 import argparse
 import logging
-from typing import Mapping
+import os
+import sys
+from typing import List, Mapping, Optional
 
 from animeon import __version__
 from animeon.ui.commands import BaseCommand
@@ -11,30 +13,110 @@ logger = logging.getLogger(__name__)
 class CLI:
     """Command Line Interface for AnimeON."""
 
-    def __init__(self, commands: Mapping[str, BaseCommand]) -> None:
+    PROFILE_FORMATS = ("json", "trace")
+    TRUE_VALUES = ("1", "true", "yes", "on")
+
+    def __init__(self) -> None:
+        """Initializes CLI application."""
+        self._parser = self._create_parser()
+        # Subcommands are dispatched by the first argument, so that
+        # `animeon <query>` keeps working for queries of any words
+        self._subcommand_parsers = {
+            "resolve": self._create_resolve_parser(),
+            "sync": self._create_sync_parser(),
+        }
+
+    @classmethod
+    def _env_flag(cls, name: str) -> bool:
         """
-        Initializes CLI application.
+        Reads boolean flag from the environment variable.
 
         Args:
-            commands: Dictionary of commands.
+            name: Variable name.
+
+        Returns:
+            True if the variable is set to 1, true, yes or on, False otherwise.
         """
-        self.commands = commands
-        self._parser = self._create_parser()
+        return os.environ.get(name, "").strip().lower() in cls.TRUE_VALUES
+
+    @classmethod
+    def _check_profile_format(cls, args: argparse.Namespace) -> None:
+        """
+        Replaces unsupported profile format taken from ANIMEON_PROFILE_FORMAT.
+
+        argparse validates choices only for values given on the command line,
+        so the default read from the environment is checked here.
 
-    @staticmethod
-    def _create_parser() -> argparse.ArgumentParser:
+        Args:
+            args: Parsed CLI arguments.
+        """
+        if args.profile_format not in cls.PROFILE_FORMATS:
+            logger.warning(
+                f"Unsupported ANIMEON_PROFILE_FORMAT: {args.profile_format}, using json"
+            )
+            args.profile_format = "json"
+
+    @classmethod
+    def _add_common_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        """
+        Adds arguments shared by all commands.
+
+        Args:
+            parser: Parser to add arguments to.
+        """
+        parser._positionals.title = "Аргументи"
+        parser._optionals.title = "Параметри"
+        parser.add_argument("-h", "--help", action="help", help="Вивести довідку")
+        parser.add_argument(
+            "-d", "--debug", action="store_true", help="Увімкнути режим налагодження"
+        )
+        parser.add_argument(
+            "--no-cache", action="store_true", help="Не використовувати кеш відповідей"
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Оновити кеш відповідей, ігноруючи збережені дані",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            default=cls._env_flag("ANIMEON_PROFILE"),
+            help="Вивести тривалість етапів та статистику запитів після завершення",
+        )
+        parser.add_argument(
+            "--profile-output",
+            metavar="PATH",
+            default=os.environ.get("ANIMEON_PROFILE_OUTPUT"),
+            help="Зберегти дані профілювання у файл",
+        )
+        parser.add_argument(
+            "--profile-format",
+            choices=cls.PROFILE_FORMATS,
+            default=os.environ.get("ANIMEON_PROFILE_FORMAT") or "json",
+            help="Формат файлу профілювання: json або trace (Chrome trace events)",
+        )
+
+    @classmethod
+    def _create_parser(cls) -> argparse.ArgumentParser:
         """Creates CLI argument parser."""
         logger.debug("Creating command line argument parser")
 
         parser = argparse.ArgumentParser(
             prog="animeon",
             description="CLI інструмент для пошуку та відтворення аніме",
-            usage="%(prog)s [параметри] <query>",
+            usage=(
+                "%(prog)s [параметри] <query>\n"
+                "       %(prog)s --live [параметри] [<query>]"
+            ),
+            epilog=(
+                "Пакетне отримання посилань: %(prog)s resolve --help\n"
+                "Оновлення локального каталогу: %(prog)s sync --help"
+            ),
+            formatter_class=argparse.RawDescriptionHelpFormatter,
             add_help=False,
         )
-        parser._positionals.title = "Аргументи"
-        parser._optionals.title = "Параметри"
-        parser.add_argument("-h", "--help", action="help", help="Вивести довідку")
+        cls._add_common_arguments(parser)
         parser.add_argument(
             "-V",
             "--version",
@@ -43,32 +125,149 @@ class CLI:
             help="Вивести версію застосунку",
         )
         parser.add_argument(
-            "-d", "--debug", action="store_true", help="Увімкнути режим налагодження"
+            "-l",
+            "--live",
+            action="store_true",
+            help="Оновлювати результати пошуку під час введення запиту",
+        )
+        parser.add_argument(
+            "--catalog",
+            action="store_true",
+            help="Шукати в локальному каталозі, оновлюючи його у фоні",
+        )
+        parser.add_argument("query", nargs="*", help="Пошуковий запит")
+
+        return parser
+
+    @classmethod
+    def _create_resolve_parser(cls) -> argparse.ArgumentParser:
+        """Creates argument parser of the resolve command."""
+        parser = argparse.ArgumentParser(
+            prog="animeon resolve",
+            description=(
+                "Отримання посилань на відео для багатьох аніме без взаємодії. "
+                "Кожен рядок стандартного вводу може містити запит та "
+                "розділені табуляцією озвучення, плеєр і епізоди."
+            ),
+            usage="%(prog)s [параметри] [<query> ...]",
+            add_help=False,
+        )
+        cls._add_common_arguments(parser)
+        parser.add_argument(
+            "--fandub", metavar="NAME|ID", help="Озвучення (за замовчуванням перше)"
+        )
+        parser.add_argument(
+            "--player", metavar="NAME|ID", help="Плеєр (за замовчуванням перший)"
+        )
+        parser.add_argument(
+            "--episodes",
+            metavar="SPEC",
+            help="Номери епізодів, наприклад 1-3,5 (за замовчуванням усі)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=("m3u", "json"),
+            default="m3u",
+            help="Формат виводу: m3u або json (JSON Lines)",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            default="-",
+            metavar="PATH",
+            help="Файл для виводу (за замовчуванням стандартний вивід)",
+        )
+        parser.add_argument(
+            "-j", "--jobs", type=int, help="Кількість аніме, що обробляються одночасно"
+        )
+        parser.add_argument(
+            "targets",
+            nargs="*",
+            metavar="query",
+            help="Пошуковий запит або id:<ID аніме>. Якщо не вказано, читається stdin",
         )
-        parser.add_argument("query", nargs="+", help="Пошуковий запит")
 
         return parser
 
-    def parse_args(self) -> argparse.Namespace:
+    @classmethod
+    def _create_sync_parser(cls) -> argparse.ArgumentParser:
+        """Creates argument parser of the sync command."""
+        parser = argparse.ArgumentParser(
+            prog="animeon sync",
+            description=(
+                "Заповнення локального каталогу аніме результатами пошуку. "
+                "Без запитів виконується пошук за кожною літерою та цифрою."
+            ),
+            usage="%(prog)s [параметри] [<query> ...]",
+            add_help=False,
+        )
+        cls._add_common_arguments(parser)
+        parser.add_argument(
+            "-j", "--jobs", type=int, help="Кількість одночасних пошукових запитів"
+        )
+        parser.add_argument(
+            "queries", nargs="*", metavar="query", help="Пошуковий запит"
+        )
+
+        return parser
+
+    def parse_args(self, argv: Optional[List[str]] = None) -> argparse.Namespace:
         """
         Parses CLI arguments.
 
+        Args:
+            argv: Optional list of arguments. If not provided, sys.argv is used.
+
         Returns:
             Parsed CLI arguments.
         """
         logger.debug("Parsing command line arguments")
 
-        args = self._parser.parse_args()
+        argv = sys.argv[1:] if argv is None else argv
+        if argv and argv[0] in self._subcommand_parsers:
+            args = self._subcommand_parsers[argv[0]].parse_args(argv[1:])
+            self._check_profile_format(args)
+            args.command = argv[0]
+            return args
+
+        args = self._parser.parse_args(argv)
+        self._check_profile_format(args)
+        if not args.query and not args.live:
+            self._parser.error("потрібен пошуковий запит")
+        if args.catalog and args.live:
+            # Live search runs in a helper process that always queries the API
+            self._parser.error("параметри --catalog та --live несумісні")
+        args.command = "search"
         args.query = " ".join(args.query)  # Converts list of words to single string
         return args
 
-    def run(self, args: argparse.Namespace) -> None:
+    def run(
+        self, args: argparse.Namespace, commands: Mapping[str, BaseCommand]
+    ) -> None:
         """
         Runs the CLI application.
 
+        Commands are passed separately from the parser, so they can be created
+        after argument parsing, only when they are actually needed.
+
         Args:
             args: Parsed CLI arguments.
+            commands: Dictionary of commands.
         """
-        search_command = self.commands.get("search")
-        if search_command:
-            search_command.execute(args.query)
+        command = commands.get(args.command)
+        if not command:
+            return
+
+        if args.command == "resolve":
+            command.execute(
+                args.targets or sys.stdin,
+                fandub=args.fandub,
+                player=args.player,
+                episodes=args.episodes,
+                output_format=args.format,
+                output=args.output,
+            )
+        elif args.command == "sync":
+            command.execute(args.queries)
+        else:
+            command.execute(args.query)
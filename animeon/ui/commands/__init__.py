@@ -1,4 +1,21 @@
-from .base import BaseCommand
-from .search import SearchCommand
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseCommand", "SearchCommand"]
+from animeon.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import BaseCommand
+    from .resolve import ResolveCommand
+    from .search import SearchCommand
+    from .sync import SyncCommand
+
+__all__ = ["BaseCommand", "ResolveCommand", "SearchCommand", "SyncCommand"]
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "BaseCommand": ".base",
+        "ResolveCommand": ".resolve",
+        "SearchCommand": ".search",
+        "SyncCommand": ".sync",
+    },
+)
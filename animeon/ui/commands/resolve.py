@@ -0,0 +1,360 @@
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional, Sequence, Set, TextIO, Tuple, TypeVar
+
+from animeon.core.api import AnimeAPI
+from animeon.models import Episode, Fandub, Player
+
+from .base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", Fandub, Player)
+
+ID_PREFIX = "id:"
+
+
+@dataclass(slots=True)
+class ResolveTarget:
+    """
+    Anime to resolve with its selectors.
+
+    Attributes:
+        query: Search query or anime ID with "id:" prefix.
+        fandub: Optional fandub name or ID. If not provided, the first fandub is used.
+        player: Optional player name or ID. If not provided, the first player is used.
+        episodes: Optional episode numbers, for example "1-3,5". If not provided, all episodes are used.
+    """
+
+    query: str
+    fandub: Optional[str] = None
+    player: Optional[str] = None
+    episodes: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ResolvedEpisode:
+    """
+    Resolved playlist entry.
+
+    Attributes:
+        query: Query the entry was resolved for.
+        anime_id: ID of the anime.
+        title: Title of the anime. Empty for targets given by anime ID.
+        fandub: Name of the fandub.
+        player: Name of the player.
+        episode: Episode number.
+        url: Video URL.
+    """
+
+    query: str
+    anime_id: int
+    title: str
+    fandub: str
+    player: str
+    episode: int
+    url: str
+
+
+def parse_target(
+    line: str, defaults: Optional[ResolveTarget] = None
+) -> Optional[ResolveTarget]:
+    """
+    Parses target from a line of input.
+
+    The line contains a query followed by optional tab-separated fandub,
+    player and episodes selectors. Empty selectors fall back to the defaults.
+
+    Args:
+        line: Line of input.
+        defaults: Optional default selectors.
+
+    Returns:
+        Parsed target or None if the line is empty.
+    """
+    fields = [field.strip() for field in line.rstrip("\n").split("\t")]
+    if not fields[0]:
+        return None
+
+    fields += [""] * (4 - len(fields))
+    defaults = defaults or ResolveTarget(query="")
+    return ResolveTarget(
+        query=fields[0],
+        fandub=fields[1] or defaults.fandub,
+        player=fields[2] or defaults.player,
+        episodes=fields[3] or defaults.episodes,
+    )
+
+
+def parse_episodes(spec: str) -> Optional[Set[int]]:
+    """
+    Parses episode numbers.
+
+    Args:
+        spec: Comma-separated episode numbers and ranges, for example "1-3,5".
+
+    Returns:
+        Set of episode numbers if the spec is valid, None otherwise.
+    """
+    numbers: Set[int] = set()
+    try:
+        for part in spec.split(","):
+            start, _, end = part.strip().partition("-")
+            numbers.update(range(int(start), int(end or start) + 1))
+    except ValueError:
+        logger.error(f"Invalid episodes selector: {spec}")
+        return None
+
+    return numbers
+
+
+class ResolveCommand(BaseCommand):
+    """Command for resolving video URLs of many anime without user interaction."""
+
+    name = "resolve"
+    desciption = "Отримання посилань на відео для багатьох аніме."
+
+    def __init__(self, api_client: AnimeAPI, max_workers: Optional[int] = None) -> None:
+        """
+        Initializes the command.
+
+        Args:
+            api_client: AnimeON API client.
+            max_workers: Optional maximum number of anime resolved at once. If not provided, value from configuration will be used.
+        """
+        self.api = api_client
+        self.max_workers = max_workers or self.api.config.max_workers
+
+    @staticmethod
+    def _match(items: Sequence[T], selector: Optional[str], kind: str) -> Optional[T]:
+        """
+        Finds fandub or player by selector.
+
+        Args:
+            items: Fandubs or players to choose from.
+            selector: Optional name or ID. If not provided, the first item is used.
+            kind: Kind of items for log messages.
+
+        Returns:
+            Matching item if found, None otherwise.
+        """
+        if not items:
+            return None
+        if not selector:
+            return items[0]
+
+        if selector.isdigit():
+            for item in items:
+                if item.id_ == int(selector):
+                    return item
+
+        name = selector.casefold()
+        for item in items:
+            if item.name.casefold() == name:
+                return item
+        for item in items:
+            if name in item.name.casefold():
+                return item
+
+        logger.error(f"No {kind} matches selector: {selector}")
+        return None
+
+    def _find_anime(self, query: str) -> Optional[Tuple[int, str]]:
+        """
+        Finds anime by query or ID.
+
+        Args:
+            query: Search query or anime ID with "id:" prefix.
+
+        Returns:
+            Anime ID and title if found, None otherwise. The title is empty for
+            anime given by ID, because the API has no endpoint to look it up.
+        """
+        if query.startswith(ID_PREFIX):
+            anime_id = query[len(ID_PREFIX) :].strip()
+            if not anime_id.isdigit():
+                logger.error(f"Invalid anime ID: {anime_id}")
+                return None
+            return int(anime_id), ""
+
+        # Only the best match is needed, so the rest of the response is not read
+        search_results = self.api.iter_search(query)
+        anime = next(search_results, None)
+        search_results.close()
+        if not anime:
+            logger.error(f"Anime not found: {query}")
+            return None
+
+        return anime.id_, anime.title
+
+    def _resolve(self, target: ResolveTarget) -> List[ResolvedEpisode]:
+        """
+        Resolves video URLs for a single target.
+
+        Args:
+            target: Anime to resolve with its selectors.
+
+        Returns:
+            Resolved episodes in order. Empty if resolution failed.
+        """
+        numbers = parse_episodes(target.episodes) if target.episodes else None
+        if target.episodes and numbers is None:
+            return []
+
+        anime = self._find_anime(target.query)
+        if not anime:
+            return []
+        anime_id, title = anime
+
+        fandub = self._match(
+            self.api.get_fandubs_and_players(anime_id) or [], target.fandub, "fandub"
+        )
+        if not fandub:
+            logger.error(f"No fandubs found for: {target.query}")
+            return []
+
+        player = self._match(fandub.players, target.player, "player")
+        if not player:
+            logger.error(f"No players found for: {target.query}")
+            return []
+
+        episodes: List[Episode] = [
+            episode
+            for episode in self.api.get_episodes(player.id_, fandub.id_) or []
+            if numbers is None or episode.episode in numbers
+        ]
+        if not episodes:
+            logger.error(f"No episodes found for: {target.query}")
+            return []
+
+        urls = self.api.get_video_urls([episode.id_ for episode in episodes])
+        return [
+            ResolvedEpisode(
+                query=target.query,
+                anime_id=anime_id,
+                title=title,
+                fandub=fandub.name,
+                player=player.name,
+                episode=episode.episode,
+                url=url,
+            )
+            for episode, url in zip(episodes, urls)
+            if url
+        ]
+
+    @staticmethod
+    def _write(
+        output: TextIO, output_format: str, entries: List[ResolvedEpisode]
+    ) -> None:
+        """
+        Writes resolved episodes and flushes the output.
+
+        Args:
+            output: Output stream.
+            output_format: "m3u" or "json" (JSON Lines).
+            entries: Resolved episodes.
+        """
+        for entry in entries:
+            if output_format == "json":
+                output.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            else:
+                title = entry.title or f"{ID_PREFIX}{entry.anime_id}"
+                output.write(f"#EXTINF:-1,{title} - Епізод {entry.episode}\n")
+                output.write(f"{entry.url}\n")
+        output.flush()
+
+    def _resolve_all(
+        self,
+        targets: Iterable[str],
+        defaults: ResolveTarget,
+        output_format: str,
+        output: TextIO,
+    ) -> None:
+        """
+        Resolves video URLs for the targets and writes them to the output stream.
+
+        Args:
+            targets: Lines with a query or "id:<anime ID>" and optional tab-separated selectors.
+            defaults: Default selectors.
+            output_format: "m3u" or "json" (JSON Lines).
+            output: Output stream.
+        """
+        if output_format == "m3u":
+            output.write("#EXTM3U\n")
+            output.flush()
+
+        total = resolved = 0
+        lock = threading.Lock()
+
+        def write_result(target: ResolveTarget, future: Future) -> None:
+            nonlocal resolved
+            try:
+                entries = future.result()
+            except Exception as error:
+                logger.error(f"Failed to resolve {target.query}: {error}")
+                entries = []
+
+            with lock:
+                resolved += bool(entries)
+                self._write(output, output_format, entries)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Targets may come from a slow pipe, so each one is written as soon
+            # as it is resolved rather than when the next line arrives
+            for line in targets:
+                target = parse_target(line, defaults)
+                if not target:
+                    continue
+
+                logger.info(f"Resolving: {target.query}")
+                future = executor.submit(self._resolve, target)
+                future.add_done_callback(
+                    lambda future, target=target: write_result(target, future)
+                )
+                total += 1
+
+        logger.info(f"Resolved {resolved} of {total} anime")
+
+    def execute(
+        self,
+        targets: Iterable[str],
+        fandub: Optional[str] = None,
+        player: Optional[str] = None,
+        episodes: Optional[str] = None,
+        output_format: str = "m3u",
+        output: str = "-",
+    ) -> None:
+        """
+        Resolves video URLs for the targets and writes them as a playlist.
+
+        Targets are resolved concurrently. Each one is written as soon as it
+        is resolved, so the output order may differ from the input order.
+
+        Args:
+            targets: Lines with a query or "id:<anime ID>" and optional tab-separated selectors.
+            fandub: Optional default fandub name or ID.
+            player: Optional default player name or ID.
+            episodes: Optional default episode numbers, for example "1-3,5".
+            output_format: "m3u" or "json" (JSON Lines).
+            output: Output file path. "-" means standard output.
+        """
+        defaults = ResolveTarget(
+            query="", fandub=fandub, player=player, episodes=episodes
+        )
+
+        if output == "-":
+            self._resolve_all(targets, defaults, output_format, sys.stdout)
+            return
+
+        try:
+            file = open(output, "w", encoding="utf-8")
+        except OSError as error:
+            logger.error(f"Failed to open output file: {error}")
+            return
+
+        with file:
+            self._resolve_all(targets, defaults, output_format, file)
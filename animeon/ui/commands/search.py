@@ -1,13 +1,20 @@
 import logging
+from typing import Any, Callable, Hashable, Iterator, List, Optional, TypeVar
 
 from animeon.core.api import AnimeAPI
+from animeon.core.prefetch import Prefetcher
+from animeon.models import Anime, Episode, Fandub, Player
 from animeon.ui.player import VideoPlayer
+from animeon.ui.prompt import NavigateBack
 from animeon.ui.selector import ContentSelector
+from animeon.utils.profiling import profiler
 
 from .base import BaseCommand
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class SearchCommand(BaseCommand):
     """Command for searching and playing anime."""
@@ -20,6 +27,9 @@ class SearchCommand(BaseCommand):
         api_client: AnimeAPI,
         selector: ContentSelector,
         player: VideoPlayer,
+        prefetcher: Optional[Prefetcher] = None,
+        live_search: bool = False,
+        use_catalog: bool = False,
     ) -> None:
         """
         Initializes the command.
@@ -28,88 +38,276 @@ class SearchCommand(BaseCommand):
             api_client: AnimeON API client.
             selector: Selector for anime content.
             player: Video player.
+            prefetcher: Optional prefetcher for loading next menus while the user is choosing.
+            live_search: Whether to search incrementally while the user is typing.
+            use_catalog: Whether to answer searches from the local catalog when it has matches.
         """
         self.api = api_client
         self.selector = selector
         self.player = player
+        self.prefetcher = prefetcher
+        self.live_search = live_search
+        self.use_catalog = use_catalog
 
-    def execute(self, query: str) -> None:
-        logger.info(f"Searching anime for query: {query}")
+    def _prefetch(
+        self, key: Hashable, function: Callable[..., Any], *args: Any
+    ) -> None:
+        """
+        Schedules a speculative request if prefetching is enabled.
+
+        Args:
+            key: Key identifying the request.
+            function: Function making the request.
+            args: Positional arguments for the function.
+        """
+        if self.prefetcher:
+            self.prefetcher.submit(key, function, *args)
+
+    def _get(self, key: Hashable, function: Callable[..., T], *args: Any) -> T:
+        """
+        Gets the result of a request, reusing a prefetched one if available.
+
+        Args:
+            key: Key identifying the request.
+            function: Function making the request.
+            args: Positional arguments for the function.
+
+        Returns:
+            Result of the request.
+        """
+        if self.prefetcher:
+            return self.prefetcher.get(key, function, *args)
+        return function(*args)
+
+    def _fetch_fandubs(self, anime_id: int) -> Optional[List[Fandub]]:
+        """
+        Gets fandubs and prefetches episodes if there is nothing else to choose from.
+
+        Args:
+            anime_id: Anime ID.
+
+        Returns:
+            List of Fandub objects if successful, None otherwise.
+        """
+        fandubs = self.api.get_fandubs_and_players(anime_id)
+        if fandubs and len(fandubs) == 1 and len(fandubs[0].players) == 1:
+            fandub = fandubs[0]
+            player = fandub.players[0]
+            self._prefetch(
+                ("episodes", player.id_, fandub.id_),
+                self.api.get_episodes,
+                player.id_,
+                fandub.id_,
+            )
+
+        return fandubs
+
+    def _resolve_video_urls(self, episode_ids: List[int]) -> Iterator[str]:
+        """
+        Resolves video URLs lazily, skipping failed episodes.
+
+        Args:
+            episode_ids: List of episode IDs.
+
+        Yields:
+            Video URLs in the same order as episode IDs.
+        """
+        urls = self.api.iter_video_urls(episode_ids)
+        for _ in episode_ids:
+            # Times each URL separately, because the consumer pauses between them
+            with profiler.stage("video_url"):
+                url = next(urls, None)
+            if url:
+                yield url
+
+    def _search(self, query: str) -> List[Anime]:
+        """
+        Searches anime by query.
+
+        Args:
+            query: Search query.
 
-        # Gets search results
-        search_results = self.api.search(query)
-        if not search_results:
-            logging.error("Anime not found")
-            return
+        Returns:
+            List of found anime.
+        """
+        # Loads fandubs of the top results while the rest are still arriving
+        search_results = []
+        with profiler.stage("search"):
+            local_results = self.api.search_local(query) if self.use_catalog else None
+            for anime in local_results or self.api.iter_search(query):
+                if len(search_results) < self.api.config.prefetch_count:
+                    self._prefetch(
+                        ("fandubs", anime.id_), self._fetch_fandubs, anime.id_
+                    )
+                search_results.append(anime)
 
         logger.debug(f"Found {len(search_results)} search results")
 
-        # Selects anime
-        selected_anime = self.selector.select_anime(search_results)
+        return search_results
+
+    def _select_anime(
+        self, query: str, search_results: Optional[List[Anime]]
+    ) -> Optional[Anime]:
+        """
+        Lets the user select anime.
+
+        Args:
+            query: Search query.
+            search_results: Results of the query, or None in live search mode.
+
+        Returns:
+            Selected anime or None if no anime is selected.
+        """
+        if search_results is None:
+            # The helper runs in fzf, so it gets the cache options explicitly
+            selected_anime = self.selector.search_anime(
+                query, use_cache=self.api.cache is not None, refresh=self.api.refresh
+            )
+        else:
+            selected_anime = self.selector.select_anime(search_results)
         if not selected_anime:
             logging.info("Anime not selected")
-            return
+            return None
 
         logger.debug(f"Selected anime: {selected_anime.title}")
 
-        # Gets fandub
-        fandubs = self.api.get_fandubs_and_players(selected_anime.id_)
+        return selected_anime
+
+    def _select_fandub(self, anime: Anime) -> Optional[Fandub]:
+        """
+        Gets fandubs of the anime and lets the user select one.
+
+        Args:
+            anime: Selected anime.
+
+        Returns:
+            Selected fandub or None if nothing was found or selected.
+        """
+        with profiler.stage("fandubs"):
+            fandubs = self._get(("fandubs", anime.id_), self._fetch_fandubs, anime.id_)
         if not fandubs:
             logging.error("No fandubs found for this anime")
-            return
+            return None
 
         logger.debug(f"Found {len(fandubs)} fandubs for this anime")
 
-        # Selects fandub
         selected_fandub = self.selector.select_fandub(fandubs)
         if not selected_fandub:
             logging.info("Fandub not selected")
-            return
+            return None
 
         logger.debug(f"Selected fandub: {selected_fandub.name}")
 
-        # Gets player
-        players = selected_fandub.players
+        return selected_fandub
+
+    def _select_player(self, fandub: Fandub) -> Optional[Player]:
+        """
+        Lets the user select a player of the fandub.
+
+        Args:
+            fandub: Selected fandub.
+
+        Returns:
+            Selected player or None if nothing was found or selected.
+        """
+        players = fandub.players
         if not players:
             logging.error("No players found for this fandub")
 
         logger.debug(f"Found {len(players)} players for this fandub")
 
-        # Selects player
+        # Loads episodes of every player while the user is choosing
+        for player in players:
+            self._prefetch(
+                ("episodes", player.id_, fandub.id_),
+                self.api.get_episodes,
+                player.id_,
+                fandub.id_,
+            )
+
         selected_player = self.selector.select_player(players)
         if not selected_player:
             logging.info("Player not selected")
-            return
+            return None
 
         logger.debug(f"Selected player: {selected_player.name}")
 
-        # Gets episodes
-        episodes = self.api.get_episodes(selected_player.id_, selected_fandub.id_)
+        return selected_player
+
+    def _select_episodes(
+        self, fandub: Fandub, player: Player
+    ) -> Optional[List[Episode]]:
+        """
+        Gets episodes of the player and lets the user select them.
+
+        Args:
+            fandub: Selected fandub.
+            player: Selected player.
+
+        Returns:
+            Selected episodes or None if nothing was found or selected.
+        """
+        with profiler.stage("episodes"):
+            episodes = self._get(
+                ("episodes", player.id_, fandub.id_),
+                self.api.get_episodes,
+                player.id_,
+                fandub.id_,
+            )
         if not episodes:
             logging.error("No episodes found")
-            return
+            return None
 
         logger.debug(f"Found {len(episodes)} episodes")
 
-        # Selects episodes
         selected_episodes = self.selector.select_episodes(episodes)
         if not selected_episodes:
             logging.info("Episodes not selected")
-            return
+            return None
 
         logger.debug(f"Selected {len(selected_episodes)} episodes")
 
-        # Gets video URLs for selected episodes
-        episode_ids = [episode.id_ for episode in selected_episodes]
-        urls = [self.api.get_video_url(id) for id in episode_ids]
-        if not urls:
-            logging.error("No episode links found")
-            return
+        return selected_episodes
+
+    def execute(self, query: str) -> None:
+        logger.info(f"Searching anime for query: {query}")
+
+        search_results = None
+        if not self.live_search:
+            search_results = self._search(query)
+            if not search_results:
+                logging.error("Anime not found")
+                return
+
+        # Each step receives the selections of the previous ones, so going
+        # back to the previous menu only drops the last selection
+        steps: List[Callable[..., Any]] = [
+            lambda: self._select_anime(query, search_results),
+            lambda anime: self._select_fandub(anime),
+            lambda anime, fandub: self._select_player(fandub),
+            lambda anime, fandub, player: self._select_episodes(fandub, player),
+        ]
+        selections: List[Any] = []
+        try:
+            while len(selections) < len(steps):
+                try:
+                    selection = steps[len(selections)](*selections)
+                except NavigateBack:
+                    if not selections:
+                        return
+                    selections.pop()
+                    continue
 
-        logger.debug(f"Found {len(urls)} episode links")
+                if not selection:
+                    return
+                selections.append(selection)
+        finally:
+            # Frees the terminal before the player starts
+            self.selector.close()
 
-        if None in urls:
-            logger.warning("Some episode links are missing!")
-            urls = [url for url in urls if url is not None]
+        # Resolves video URLs in the background while the player starts
+        episode_ids = [episode.id_ for episode in selections[-1]]
+        urls = self._resolve_video_urls(episode_ids)
 
-        self.player.play(urls)  # type: ignore
+        with profiler.stage("playback"):
+            self.player.play(urls)
@@ -0,0 +1,60 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from animeon.core.api import AnimeAPI
+from animeon.core.catalog import AnimeCatalog
+
+from .base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class SyncCommand(BaseCommand):
+    """Command for filling the local anime catalog from the API."""
+
+    name = "sync"
+    desciption = "Оновлення локального каталогу аніме."
+
+    def __init__(
+        self,
+        api_client: AnimeAPI,
+        catalog: AnimeCatalog,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Initializes the command.
+
+        Args:
+            api_client: AnimeON API client.
+            catalog: Catalog to fill.
+            max_workers: Optional maximum number of concurrent searches. If not provided, value from configuration will be used.
+        """
+        self.api = api_client
+        self.catalog = catalog
+        self.max_workers = max_workers or self.api.config.max_workers
+
+    def execute(self, queries: Optional[Iterable[str]] = None) -> None:
+        """
+        Runs searches and stores their results in the catalog.
+
+        Args:
+            queries: Optional search queries. If not provided, queries from the catalog configuration are used.
+        """
+        queries = list(queries or self.catalog.config.sync_queries)
+        logger.info(f"Synchronizing catalog with {len(queries)} queries")
+
+        before = self.catalog.count()
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for query, results in zip(queries, executor.map(self.api.search, queries)):
+                if results is None:
+                    failed += 1
+                    logger.warning(f"Failed to search: {query}")
+                else:
+                    self.catalog.add(results)
+
+        total = self.catalog.count()
+        print(f"Каталог оновлено: {total} аніме (нових: {total - before})")
+        if failed:
+            logger.error(f"{failed} of {len(queries)} searches failed")
@@ -0,0 +1,23 @@
+import sys
+
+from animeon.core import HTTPClient
+
+from .preview import AnimePreviewGenerator
+from .session import SearchSession
+
+USAGE = "Usage: python -m animeon.ui.lazy_preview <session_dir> <anime_id>"
+
+
+def main() -> None:
+    """Renders a single lazy preview for the item hovered in fzf."""
+    args = sys.argv[1:]
+    if len(args) != 2 or not args[1].isdigit():
+        sys.exit(USAGE)
+
+    with HTTPClient() as http_client:
+        generator = AnimePreviewGenerator(http_client)
+        print(generator.render_session(SearchSession(args[0]), int(args[1])))
+
+
+if __name__ == "__main__":
+    main()
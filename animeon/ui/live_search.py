@@ -0,0 +1,112 @@
+import logging
+import os
+import sys
+from typing import Iterable, Optional, Set
+
+from animeon.config import SearchConfig
+from animeon.core import AnimeAPI, HTTPClient, SQLiteResponseCache
+from animeon.models import Anime
+
+from .prompt import Prompt
+from .session import SearchSession
+
+OPTIONS = ("--no-cache", "--refresh")
+
+
+def emit(anime_list: Iterable[Anime], printed: Set[int]) -> None:
+    """
+    Prints anime that were not printed yet.
+
+    Args:
+        anime_list: Anime to print.
+        printed: IDs of already printed anime. Updated in place.
+    """
+    for anime in anime_list:
+        if anime.id_ not in printed:
+            printed.add(anime.id_)
+            print(Prompt.format_option(anime.id_, anime.title), flush=True)
+
+
+def search(
+    session: SearchSession, query: str, use_cache: bool = True, refresh: bool = False
+) -> None:
+    """
+    Prints results of the query for fzf reload.
+
+    Results of the query itself are reused if it was completed in this
+    session. Otherwise matching results of the longest completed prefix are
+    printed immediately, and the rest are streamed from the API.
+
+    Args:
+        session: Current search session.
+        query: Search query.
+        use_cache: Whether to use the response cache.
+        refresh: Whether to ignore cached responses, while still storing new ones.
+    """
+    cached = session.get_results(query)
+    if cached is not None:
+        emit(cached, set())
+        return
+
+    printed: Set[int] = set()
+    prefix_results = session.find_prefix_results(query)
+    if prefix_results:
+        emit(prefix_results[1], printed)
+
+    anime_ids = []
+    with HTTPClient() as http_client:
+        response_cache: Optional[SQLiteResponseCache] = (
+            SQLiteResponseCache() if use_cache else None
+        )
+        try:
+            api = AnimeAPI(http_client, cache=response_cache)
+            api.refresh = refresh
+            for anime in api.iter_search(query):
+                session.put_anime(anime)
+                anime_ids.append(anime.id_)
+                emit([anime], printed)
+        finally:
+            if response_cache:
+                response_cache.close()
+
+    # An empty list may mean a failed request, so it is not reused
+    if anime_ids:
+        session.put_results(query, anime_ids)
+
+
+def main() -> None:
+    """
+    Prints search results for the query typed in fzf.
+
+    The query is always the last argument, because fzf appends it to the
+    command. Cache options of the CLI come between the session and the query.
+    """
+    options = set(sys.argv[2:-1])
+    if len(sys.argv) < 3 or not options <= set(OPTIONS):
+        sys.exit(
+            "Usage: python -m animeon.ui.live_search <session_dir> "
+            "[--no-cache] [--refresh] <query>"
+        )
+
+    session_dir, query = sys.argv[1], sys.argv[-1].strip()
+    if len(query) < SearchConfig.default().min_query_length:
+        return
+
+    # Log messages would be drawn over the fzf interface
+    logging.disable(logging.CRITICAL)
+
+    try:
+        search(
+            SearchSession(session_dir),
+            query,
+            use_cache="--no-cache" not in options,
+            refresh="--refresh" in options,
+        )
+    except BrokenPipeError:
+        # fzf stopped reading, because the query changed again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
+import json
 import logging
+import os
+import shutil
+import socket
 import subprocess
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, Iterator, List, Optional
+
+from animeon.utils.profiling import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -10,52 +18,192 @@ class VideoPlayer(ABC):
     """Abstract class for video player."""
 
     @abstractmethod
-    def play(self, urls: List[str]) -> None:
+    def play(self, urls: Iterable[str]) -> None:
         """
         Plays video from the specified URLs.
 
         Args:
-            urls: List of video URLs.
+            urls: Iterable of video URLs. It may be lazy and still be producing URLs while playback starts.
         """
         pass
 
     @staticmethod
-    def _validate_urls(urls: List[str]) -> bool:
+    def _first_url(urls: Iterator[str]) -> Optional[str]:
         """
-        Validates URLs.
+        Gets the first URL from the iterator.
 
         Args:
-            urls: List of video URLs.
+            urls: Iterator of video URLs.
 
         Returns:
-            True if URLs are valid, False otherwise.
+            First URL if available, None otherwise.
         """
-        if not urls:
+        url = next(urls, None)
+        if not url:
             logger.error("Video URLs are missing!")
-            return False
-        return True
+            return None
+        return url
 
 
 class MpvPlayer(VideoPlayer):
     """Video player using mpv."""
 
-    def play(self, urls: List[str]) -> None:
+    IPC_CONNECT_TIMEOUT = 10.0
+    IPC_CONNECT_INTERVAL = 0.05
+    STOP_TIMEOUT = 5.0
+
+    def play(self, urls: Iterable[str]) -> None:
         """
         Plays video from the specified URLs using mpv.
 
+        mpv is started as soon as the first URL is available. The remaining URLs
+        are appended to its playlist through the JSON IPC socket as they arrive.
+        mpv idles instead of exiting until the last URL is appended, so the
+        playlist survives an episode that ends before the next one resolves.
+        If the IPC socket fails, mpv is stopped and started again with the
+        whole playlist, because it would otherwise never leave idle mode.
+
         Args:
-            urls: List of video URLs.
+            urls: Iterable of video URLs.
         """
-        self._validate_urls(urls)
+        url_iterator = iter(urls)
+        first_url = self._first_url(url_iterator)
+        if not first_url:
+            return
+
+        ipc_dir = tempfile.mkdtemp(prefix="animeon-")
+        ipc_path = os.path.join(ipc_dir, "mpv.sock")
+        playlist = [first_url]
 
         try:
-            logger.info(f"Playing {len(urls)} episodes via mpv")
-            logger.debug(f"URLs: {urls}")
-
-            command = ["mpv", *urls]
-            with subprocess.Popen(
-                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            ) as process:
-                process.communicate()
-        except subprocess.SubprocessError as error:
+            logger.info("Starting playback via mpv")
+            logger.debug(f"URL: {first_url}")
+
+            command = [
+                "mpv",
+                "--idle=yes",
+                f"--input-ipc-server={ipc_path}",
+                first_url,
+            ]
+            with profiler.stage("player.launch"):
+                process = subprocess.Popen(
+                    command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+            with process:
+                complete = False
+                try:
+                    complete = self._append_urls(
+                        process, ipc_path, url_iterator, playlist
+                    )
+                finally:
+                    if not complete:
+                        self._stop(process)
+                process.wait()
+
+            if not complete:
+                playlist.extend(url_iterator)
+                logger.warning(f"Restarting mpv with {len(playlist)} episodes")
+                subprocess.run(
+                    ["mpv", *playlist],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+        except (subprocess.SubprocessError, OSError) as error:
             logger.error(f"Error executing mpv: {error}")
+        finally:
+            # Cancels resolution of episodes that will not be played
+            if hasattr(url_iterator, "close"):
+                url_iterator.close()  # type: ignore
+            shutil.rmtree(ipc_dir, ignore_errors=True)
+
+    def _stop(self, process: subprocess.Popen) -> None:
+        """
+        Stops mpv if it is still running.
+
+        Args:
+            process: Running mpv process.
+        """
+        if process.poll() is not None:
+            return
+
+        process.terminate()
+        try:
+            process.wait(timeout=self.STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def _connect_ipc(
+        self, process: subprocess.Popen, ipc_path: str
+    ) -> Optional[socket.socket]:
+        """
+        Connects to the mpv IPC socket.
+
+        Args:
+            process: Running mpv process.
+            ipc_path: Path to the IPC socket.
+
+        Returns:
+            Connected socket if successful, None otherwise.
+        """
+        deadline = time.monotonic() + self.IPC_CONNECT_TIMEOUT
+        while time.monotonic() < deadline and process.poll() is None:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                client.connect(ipc_path)
+                return client
+            except OSError:
+                client.close()
+                time.sleep(self.IPC_CONNECT_INTERVAL)
+
+        if process.poll() is None:
+            logger.error("Failed to connect to mpv IPC socket")
+        return None
+
+    def _append_urls(
+        self,
+        process: subprocess.Popen,
+        ipc_path: str,
+        urls: Iterator[str],
+        playlist: List[str],
+    ) -> bool:
+        """
+        Appends URLs to the mpv playlist as they become available.
+
+        Args:
+            process: Running mpv process.
+            ipc_path: Path to the IPC socket.
+            urls: Iterator of the remaining video URLs.
+            playlist: URLs already passed to mpv. Appended URLs are added to it.
+
+        Returns:
+            True if mpv left idle mode or exited, False if the IPC socket failed
+            while mpv is still running.
+        """
+        client = self._connect_ipc(process, ipc_path)
+        if client is None:
+            return process.poll() is not None
+
+        try:
+            for url in urls:
+                if process.poll() is not None:
+                    logger.debug("mpv exited, stopping playlist updates")
+                    return True
+
+                logger.debug(f"Appending URL to playlist: {url}")
+                # Starts playback if mpv went idle waiting for this episode
+                command = {"command": ["loadfile", url, "append-play"]}
+                client.sendall(json.dumps(command).encode() + b"\n")
+                playlist.append(url)
+
+            # The playlist is complete, so mpv may exit after its last file
+            command = {"command": ["set_property", "idle", "no"]}
+            client.sendall(json.dumps(command).encode() + b"\n")
+        except OSError as error:
+            logger.error(f"Failed to update mpv playlist: {error}")
+            return process.poll() is not None
+        finally:
+            client.close()
+
+        logger.info(f"Playing {len(playlist)} episodes via mpv")
+        return True
@@ -1,11 +1,21 @@
-import json
+import hashlib
 import logging
+import os
+import shlex
 import subprocess
+import sys
 import tempfile
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 
-from animeon.core import HTTPClient
+from animeon.config import CacheConfig, PreviewConfig
+from animeon.core import DiskCache, HTTPClient, PosterCache
 from animeon.models import Anime
+from animeon.utils import get_cache_dir
+
+from .session import SearchSession
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +23,6 @@ logger = logging.getLogger(__name__)
 class AnimePreviewGenerator:
     """Class for creating previews of anime content."""
 
-    CHAFA_BASE_COMMAND = ["chafa", "--size=45x25"]
     TYPES = {
         "tv": "ТБ-серіал",
         "movie": "Фільм",
@@ -26,29 +35,70 @@ class AnimePreviewGenerator:
         "released": "Завершено",
         "anons": "Незабаром",
     }
+    # Environment variables chafa uses to detect output format and colours
+    TERMINAL_VARIABLES = ("TERM", "COLORTERM", "TERM_PROGRAM")
 
-    def __init__(self, http_client: HTTPClient) -> None:
+    def __init__(
+        self,
+        http_client: HTTPClient,
+        config: Optional[PreviewConfig] = None,
+        poster_cache: Optional[PosterCache] = None,
+        render_cache: Optional[DiskCache] = None,
+    ) -> None:
         """
         Initializes the class.
 
         Args:
             http_client: HTTP client for making requests.
+            config: Optional preview configuration. If not provided, default configuration will be used.
+            poster_cache: Optional cache of poster images. If not provided, default cache will be used.
+            render_cache: Optional cache of chafa output. If not provided, default cache will be used.
         """
         self.http_client = http_client
+        self.config = config or PreviewConfig.default()
+        self.poster_cache = poster_cache or PosterCache(http_client)
+        self.render_cache = render_cache or DiskCache(
+            get_cache_dir("previews"), CacheConfig.default().render_max_size
+        )
 
-    def _create_preview(self, anime: Anime) -> str:
+    @property
+    def chafa_command(self) -> List[str]:
+        """Command for rendering images with chafa."""
+        command = ["chafa", f"--size={self.config.chafa_size}"]
+        if self.config.chafa_format:
+            command.append(f"--format={self.config.chafa_format}")
+        if self.config.chafa_colors:
+            command.append(f"--colors={self.config.chafa_colors}")
+        return command
+
+    def _render_key(self, image: bytes) -> str:
         """
-        Creates a formatted preview string for an anime.
+        Builds cache key for rendered image.
+
+        The key covers everything that affects chafa output: the image itself,
+        the command options and the terminal variables used for auto-detection.
 
         Args:
-            anime: Anime object to create preview.
+            image: Image content.
 
         Returns:
-            Formatted string.
+            Cache key.
         """
-        logger.debug(f"Creating preview for anime: {anime.title}")
+        terminal = [os.environ.get(name, "") for name in self.TERMINAL_VARIABLES]
+        return "\0".join(
+            [hashlib.sha256(image).hexdigest(), *self.chafa_command, *terminal]
+        )
 
-        poster = self._generate_image_preview(anime.poster)
+    def _create_header(self, anime: Anime) -> str:
+        """
+        Creates a formatted text description of an anime up to its description.
+
+        Args:
+            anime: Anime object to describe.
+
+        Returns:
+            Formatted string.
+        """
         type_ = self.TYPES.get(anime.type_, "Невідомо")
         rating = (
             f"{anime.rating} ({anime.scored_by or '???'} голосів)"
@@ -59,7 +109,6 @@ class AnimePreviewGenerator:
         separator = "─" * 50
 
         return (
-            f"{poster}\n"
             f"{separator}\n"
             f"{anime.title}\n"
             f"{separator}\n"
@@ -71,9 +120,21 @@ class AnimePreviewGenerator:
             f"🎬 Продюсер: {anime.producer or 'Невідомо'}\n"
             f"{separator}\n"
             "📝 Опис:\n"
-            f"{anime.description or 'Опис відсутній'}"
         )
 
+    def _create_details(self, anime: Anime) -> str:
+        """
+        Creates a formatted text description of an anime without poster.
+
+        Args:
+            anime: Anime object to describe.
+
+        Returns:
+            Formatted string.
+        """
+        description = anime.clean_description or "Опис відсутній"
+        return self._create_header(anime) + description
+
     def _generate_image_preview(self, image_url: str) -> Optional[str]:
         """
         Generates ASCII art preview of an image URL.
@@ -86,45 +147,236 @@ class AnimePreviewGenerator:
         """
         logger.debug(f"Generating image preview for URL: {image_url}")
 
-        try:
-            image = self.http_client.get(image_url, as_json=False)
+        return self._render_image(self._download_image(image_url))
+
+    def _download_image(self, image_url: str) -> Optional[bytes]:
+        """
+        Downloads an image.
 
+        Args:
+            image_url: URL of the image to download.
+
+        Returns:
+            Image content if successful, None otherwise.
+        """
+        if not image_url:
+            return None
+
+        return self.poster_cache.get(image_url)
+
+    def _render_image(self, image: Optional[bytes]) -> Optional[str]:
+        """
+        Converts an image to ASCII art with chafa.
+
+        Args:
+            image: Image content.
+
+        Returns:
+            ASCII art string if successful, None if failed.
+        """
+        if not image:
+            return None
+
+        key = self._render_key(image)
+        cached = self.render_cache.get(key)
+        if cached is not None:
+            return cached.decode()
+
+        try:
             with subprocess.Popen(
-                self.CHAFA_BASE_COMMAND,
+                self.chafa_command,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
             ) as process:
                 stdout, _ = process.communicate(input=image)
-
-                return stdout.decode().strip() if stdout else None
-        except subprocess.CalledProcessError as error:
+        except (subprocess.SubprocessError, OSError) as error:
             logger.error(f"Error executing chafa: {error}")
             return None
 
-    def generate(self, anime_list: List[Anime]) -> str:
+        if not stdout:
+            return None
+
+        rendered = stdout.decode().strip()
+        self.render_cache.put(key, rendered.encode())
+        return rendered
+
+    def _generate_image_previews(self, image_urls: List[str]) -> List[Optional[str]]:
         """
-        Generates preview data for a list of anime.
+        Downloads and renders images in a pipeline.
+
+        Images are downloaded concurrently and each one is passed to chafa as
+        soon as it arrives. The number of chafa processes is capped at the CPU count.
 
         Args:
-            anime_list: List of Anime objects to generate previews.
+            image_urls: URLs of the images to convert.
 
         Returns:
-            Path to temporary JSON file containing preview data.
+            ASCII art strings in the same order as URLs. Failed images are represented by None.
         """
+        if not image_urls:
+            return []
+
+        download_workers = min(self.config.download_workers, len(image_urls))
+        render_workers = min(os.cpu_count() or 1, len(image_urls))
+        download_time = 0.0
+        render_time = 0.0
+        lock = threading.Lock()
+
+        def download(url: str) -> Optional[bytes]:
+            nonlocal download_time
+            start = time.perf_counter()
+            image = self._download_image(url)
+            with lock:
+                download_time += time.perf_counter() - start
+            return image
+
+        def render(image: Optional[bytes]) -> Optional[str]:
+            nonlocal render_time
+            start = time.perf_counter()
+            result = self._render_image(image)
+            with lock:
+                render_time += time.perf_counter() - start
+            return result
+
+        start = time.perf_counter()
+        with (
+            ThreadPoolExecutor(max_workers=download_workers) as downloader,
+            ThreadPoolExecutor(max_workers=render_workers) as renderer,
+        ):
+            downloads = {
+                downloader.submit(download, url): index
+                for index, url in enumerate(image_urls)
+            }
+            renders: Dict[int, Future] = {}
+            for future in as_completed(downloads):
+                renders[downloads[future]] = renderer.submit(render, future.result())
+
+            results = [renders[index].result() for index in range(len(image_urls))]
+
+        logger.debug(
+            f"Rendered {len(image_urls)} posters in "
+            f"{time.perf_counter() - start:.2f}s "
+            f"(download: {download_time:.2f}s over {download_workers} workers, "
+            f"chafa: {render_time:.2f}s over {render_workers} workers)"
+        )
+
+        return results
+
+    def generate(self, anime_list: List[Anime], session: SearchSession) -> None:
+        """
+        Stores preview data for a list of anime in the search session.
+
+        In eager mode every preview is rendered and written to its own file, so
+        fzf only has to read one file per hovered item. In lazy mode only the
+        anime are stored; posters are rendered and descriptions are cleaned on
+        demand by the preview command when an item is hovered in fzf.
+
+        Args:
+            anime_list: List of Anime objects to generate previews.
+            session: Search session to store previews in.
+        """
+        if self.config.lazy:
+            logger.info(f"Preparing lazy previews for {len(anime_list)} anime")
+            for anime in anime_list:
+                session.put_anime(anime)
+            return
+
         logger.info(f"Generating previews for {len(anime_list)} anime")
+        posters = self._generate_image_previews([anime.poster for anime in anime_list])
+        for anime, poster in zip(anime_list, posters):
+            details = self._create_details(anime)
+            preview = f"{poster}\n{details}" if poster else details
+            self._write_rendered(session.preview_path(anime.id_), preview)
+
+        logger.debug(f"Stored previews in {session.path}")
+
+    def preview_command(self, session: SearchSession, lazy: bool = False) -> str:
+        """
+        Builds fzf preview command for anime stored in the search session.
+
+        The hovered line must start with the anime ID followed by a tab.
+        Rendered previews are read with cat; in lazy mode missing ones are
+        rendered by a helper process.
+
+        Args:
+            session: Search session the previews are stored in.
+            lazy: Whether to render missing previews even if the configuration is eager.
+
+        Returns:
+            Shell command with fzf placeholder for the hovered item.
+        """
+        previews = shlex.quote(os.path.join(session.path, "previews"))
+        command = f"cat {previews}/{{1}}"
+        if lazy or self.config.lazy:
+            python = shlex.quote(sys.executable)
+            session_path = shlex.quote(session.path)
+            command += (
+                f" 2>/dev/null || {python} -m animeon.ui.lazy_preview "
+                f"{session_path} {{1}}"
+            )
+
+        return command
+
+    @staticmethod
+    def _read_rendered(path: str) -> Optional[str]:
+        """
+        Reads previously rendered preview.
+
+        Args:
+            path: Path to the rendered preview.
 
-        previews = {}
-        for anime in anime_list:
-            previews[anime.title] = self._create_preview(anime)
+        Returns:
+            Rendered preview if it exists, None otherwise.
+        """
+        try:
+            with open(path, encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_rendered(path: str, preview: str) -> None:
+        """
+        Stores rendered preview.
 
-        logger.debug("Creating temporary JSON file")
+        Writes atomically, because fzf may kill the previous preview command.
 
+        Args:
+            path: Path to the rendered preview.
+            preview: Rendered preview.
+        """
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
         with tempfile.NamedTemporaryFile(
-            mode="w", encoding="utf-8", suffix=".json", delete=False
-        ) as preview_file:
-            json.dump(previews, preview_file, ensure_ascii=False, indent=4)
-            preview_file_path = preview_file.name
-            logger.debug(f"Created temporary file at: {preview_file_path}")
+            mode="w", encoding="utf-8", dir=directory, delete=False
+        ) as file:
+            file.write(preview)
+        os.replace(file.name, path)
+
+    def render_session(self, session: SearchSession, anime_id: int) -> str:
+        """
+        Renders a single preview of anime stored in the search session.
+
+        Args:
+            session: Search session the anime was found in.
+            anime_id: ID of the hovered anime.
+
+        Returns:
+            Formatted preview string.
+        """
+        cache_path = session.preview_path(anime_id)
+        cached = self._read_rendered(cache_path)
+        if cached is not None:
+            return cached
+
+        anime = session.get_anime(anime_id)
+        if not anime:
+            return ""
+
+        details = self._create_details(anime)
+        poster = self._generate_image_preview(anime.poster)
+        preview = f"{poster}\n{details}" if poster else details
 
-        return preview_file_path
+        self._write_rendered(cache_path, preview)
+        return preview
@@ -1,10 +1,24 @@
 import logging
+import os
+import secrets
+import select
+import shlex
+import shutil
+import socket
 import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
 from typing import List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
 
+class NavigateBack(Exception):
+    """Raised when the user asks to return to the previous menu."""
+
+
 class Prompt:
     """Class for prompting user with fzf."""
 
@@ -17,6 +31,36 @@ class Prompt:
         "--pointer=❯",
         "--marker=◆ ",
     ]
+    # Hides the key field, but keeps it in preview placeholders and output
+    KEYED_OPTIONS = ["--delimiter", "\t", "--with-nth", "2.."]
+
+    @staticmethod
+    def format_option(key: object, label: str) -> str:
+        """
+        Formats option with a hidden key.
+
+        Args:
+            key: Key identifying the option. Must not contain whitespace.
+            label: Text shown to the user.
+
+        Returns:
+            Line with the key and the label separated by a tab.
+        """
+        label = " ".join(label.split())  # Tabs and newlines would break the line
+        return f"{key}\t{label}"
+
+    @staticmethod
+    def _key(line: str) -> str:
+        """
+        Extracts key from an option with a hidden key.
+
+        Args:
+            line: Option line.
+
+        Returns:
+            Key of the option.
+        """
+        return line.split("\t", 1)[0]
 
     @staticmethod
     def _validate_options(options: List[str]) -> bool:
@@ -35,7 +79,11 @@ class Prompt:
         return True
 
     def single_select(
-        self, prompt_text: str, options: List[str], preview_file: Optional[str] = None
+        self,
+        prompt_text: str,
+        options: List[str],
+        preview_command: Optional[str] = None,
+        keyed: bool = False,
     ) -> Optional[str]:
         """
         Prompts user to select one option.
@@ -43,9 +91,12 @@ class Prompt:
         Args:
             prompt_text: Input prompt text.
             options: List of options.
+            preview_command: Optional shell command for fzf preview window.
+            keyed: Whether options are formatted with format_option().
 
         Returns:
-            Selected option or None if no option is selected.
+            Selected option, or its key if options are keyed, or None if no
+            option is selected.
         """
         if not self._validate_options(options):
             return None
@@ -53,25 +104,78 @@ class Prompt:
         # Changes input prompt text
         command = [*self.FZF_BASE_COMMAND, "--prompt", prompt_text]
 
-        # Adds preview if preview file is provided
-        if preview_file:
-            preview_command = (
-                f"jq --raw-output --arg title {{}} '.[$title]' {preview_file}"
-            )
+        if keyed:
+            command.extend(self.KEYED_OPTIONS)
+
+        # Adds preview if preview command is provided
+        if preview_command:
             command.extend(["--preview", preview_command])
 
-        return self._run_fzf(command, "\n".join(options))
+        selected = self._run_fzf(command, "\n".join(options))
+
+        return self._key(selected) if selected and keyed else selected
+
+    def live_select(
+        self,
+        prompt_text: str,
+        query: str,
+        source_command: str,
+        preview_command: Optional[str] = None,
+        debounce: float = 0.2,
+    ) -> Optional[str]:
+        """
+        Prompts user to select one option from a list reloaded as the query changes.
+
+        Options are produced by the source command with the current query
+        appended, formatted with format_option().
 
-    def multi_select(self, prompt_text: str, options: List[str]) -> Optional[Set[str]]:
+        Args:
+            prompt_text: Input prompt text.
+            query: Initial query.
+            source_command: Shell command printing options for a query.
+            preview_command: Optional shell command for fzf preview window.
+            debounce: Delay after the last keystroke before reloading, in seconds.
+
+        Returns:
+            Key of the selected option or None if no option is selected.
+        """
+        # fzf terminates the previous reload when the query changes again,
+        # so the delay before the command debounces the requests
+        command = [
+            *self.FZF_BASE_COMMAND,
+            "--prompt",
+            prompt_text,
+            "--query",
+            query,
+            "--disabled",
+            *self.KEYED_OPTIONS,
+            "--bind",
+            f"start:reload:{source_command} {{q}}",
+            "--bind",
+            f"change:reload:sleep {debounce}; {source_command} {{q}}",
+        ]
+
+        if preview_command:
+            command.extend(["--preview", preview_command])
+
+        selected = self._run_fzf(command, "")
+
+        return self._key(selected) if selected else None
+
+    def multi_select(
+        self, prompt_text: str, options: List[str], keyed: bool = False
+    ) -> Optional[Set[str]]:
         """
         Prompts user to select multiple options.
 
         Args:
             prompt_text: Input prompt text.
             options: List of options.
+            keyed: Whether options are formatted with format_option().
 
         Returns:
-            Set of selected options or None if no option is selected.
+            Set of selected options, or their keys if options are keyed, or
+            None if no option is selected.
         """
         if not self._validate_options(options):
             return None
@@ -79,12 +183,20 @@ class Prompt:
         # Changes input prompt text and enables multiselection
         command = [*self.FZF_BASE_COMMAND, "--prompt", prompt_text, "--multi"]
 
+        if keyed:
+            command.extend(self.KEYED_OPTIONS)
+
         stdout = self._run_fzf(command, "\n".join(options))
 
         if not stdout:
             return None
 
-        return set(stdout.split("\n"))
+        lines = stdout.split("\n")
+
+        return {self._key(line) for line in lines} if keyed else set(lines)
+
+    def close(self) -> None:
+        """Releases resources held by the prompt."""
 
     def _run_fzf(self, command: List[str], input_: str) -> Optional[str]:
         """
@@ -115,3 +227,338 @@ class Prompt:
                 logger.error(f"Error executing fzf: {error}")
 
             return None
+
+
+class PersistentPrompt(Prompt):
+    """
+    Prompt that keeps a single fzf process open across menus.
+
+    fzf is controlled through its --listen HTTP server: each menu replaces
+    the list with reload and updates the prompt and preview, while the
+    chosen keys are reported back through a FIFO. Switching menus therefore
+    neither starts a new process nor redraws the terminal. Escape returns to
+    the previous menu by raising NavigateBack.
+
+    Every line carries the number of its menu in a hidden last field, and key
+    presses report it, so late events from a previous menu are ignored.
+    Selection of several lines is enabled only for multi-select menus. The
+    fzf server requires a random API key, so other local users cannot send
+    actions to it.
+
+    Falls back to a new fzf process per menu if fzf does not support --listen
+    or change-multi.
+    """
+
+    # Parentheses are preferred, the rest are used if the argument contains them
+    ACTION_DELIMITERS = ["()", "[]", "{}", "<>", *"~!@#$%^&*;/|"]
+    STARTUP_TIMEOUT = 2.0
+    # Hides the key and the menu number fields
+    MENU_OPTIONS = ["--delimiter", "\t", "--with-nth", "2..-2"]
+
+    def __init__(self) -> None:
+        """Initializes the prompt. fzf is started on the first menu."""
+        self._process: Optional[subprocess.Popen] = None
+        self._directory: Optional[str] = None
+        self._events: Optional[int] = None
+        self._buffer = b""
+        self._port = 0
+        self._api_key = ""
+        self._menus = 0
+        self._supported = True
+
+    @staticmethod
+    def _free_port() -> int:
+        """Finds a free local TCP port for the fzf server."""
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            return sock.getsockname()[1]
+
+    @classmethod
+    def _action(cls, name: str, argument: str) -> str:
+        """
+        Formats fzf action with an argument.
+
+        Args:
+            name: Action name.
+            argument: Action argument.
+
+        Returns:
+            Action string.
+        """
+        for delimiter in cls.ACTION_DELIMITERS:
+            start, end = delimiter[0], delimiter[-1]
+            if start not in argument and end not in argument:
+                return f"{name}{start}{argument}{end}"
+
+        # The colon form takes the rest of the string, so it must be the last action
+        return f"{name}:{argument}"
+
+    def _start(self) -> bool:
+        """
+        Starts fzf with an empty list.
+
+        Returns:
+            True if fzf is running and accepts actions, False otherwise.
+        """
+        self._directory = tempfile.mkdtemp(prefix="animeon-fzf-")
+        events_path = os.path.join(self._directory, "events")
+        os.mkfifo(events_path)
+        # Keeps the FIFO open for writing too, so reads never hit end of file
+        # between the short-lived writers spawned by fzf
+        self._events = os.open(events_path, os.O_RDWR | os.O_NONBLOCK)
+        self._port = self._free_port()
+        self._api_key = secrets.token_urlsafe(32)
+
+        # Events are "<name> <menu of the current line> [<keys>]"
+        events = shlex.quote(events_path)
+        command = [
+            *self.FZF_BASE_COMMAND,
+            "--listen",
+            str(self._port),
+            *self.MENU_OPTIONS,
+            "--bind",
+            f"enter:execute-silent(echo select {{-1}} {{+1}} > {events})"
+            "+clear-selection",
+            "--bind",
+            f"esc:execute-silent(echo back {{-1}} > {events})",
+        ]
+        logger.debug(f"Starting persistent fzf on port {self._port}")
+        try:
+            self._process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env={**os.environ, "FZF_API_KEY": self._api_key},
+            )
+        except OSError as error:
+            logger.error(f"Error executing fzf: {error}")
+            return False
+
+        # Also checks that fzf knows change-multi, which menus use to toggle it
+        if not self._post("change-multi(0)", self.STARTUP_TIMEOUT):
+            logger.warning("fzf does not accept actions, starting it for every menu")
+            return False
+
+        return True
+
+    def _post(self, action: str, timeout: float = 0.0) -> bool:
+        """
+        Sends action to the running fzf.
+
+        Args:
+            action: fzf action string.
+            timeout: How long to retry while the fzf server is starting, in seconds.
+
+        Returns:
+            True if the action was accepted, False otherwise.
+        """
+        request = urllib.request.Request(
+            f"http://localhost:{self._port}",
+            data=action.encode(),
+            headers={"x-api-key": self._api_key},
+            method="POST",
+        )
+        deadline = time.monotonic() + timeout
+        while self._process and self._process.poll() is None:
+            try:
+                with urllib.request.urlopen(request, timeout=5):
+                    return True
+            except urllib.error.HTTPError as error:
+                logger.error(f"fzf rejected action {action!r}: {error.read()!r}")
+                return False
+            except OSError as error:
+                if time.monotonic() >= deadline:
+                    logger.error(f"Error sending action to fzf: {error}")
+                    return False
+                time.sleep(0.02)
+
+        return False
+
+    def _read_event(self) -> Optional[str]:
+        """
+        Waits for the next key press reported by fzf.
+
+        Returns:
+            Event line or None if fzf exited.
+        """
+        while b"\n" not in self._buffer:
+            if not self._process or self._process.poll() is not None:
+                return None
+            ready, _, _ = select.select([self._events], [], [], 0.1)
+            if ready:
+                self._buffer += os.read(self._events, 4096)
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line.decode()
+
+    def _drain_events(self) -> None:
+        """Discards key presses that were reported but not read yet."""
+        self._buffer = b""
+        if self._events is None:
+            return
+
+        try:
+            while os.read(self._events, 4096):
+                pass
+        except BlockingIOError:
+            pass  # The FIFO is empty
+
+    def _show(
+        self,
+        prompt_text: str,
+        lines: List[str],
+        preview_command: Optional[str],
+        multi: bool = False,
+    ) -> Optional[List[str]]:
+        """
+        Replaces the menu in the running fzf and waits for a choice.
+
+        Args:
+            prompt_text: Input prompt text.
+            lines: Input lines formatted with format_option().
+            preview_command: Optional shell command for fzf preview window.
+            multi: Whether several options can be chosen.
+
+        Returns:
+            Keys of the chosen options or None if fzf exited.
+
+        Raises:
+            NavigateBack: If the user asked to return to the previous menu.
+        """
+        if self._process is None and not self._start():
+            self._supported = False
+            self.close()
+            return None
+
+        self._menus += 1
+        menu = str(self._menus)
+        options_path = os.path.join(self._directory or "", f"menu-{menu}")
+        with open(options_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(f"{line}\t{menu}" for line in lines))
+
+        actions = [
+            "change-multi" if multi else "change-multi(0)",
+            self._action("change-prompt", prompt_text),
+            "clear-query",
+            self._action("reload", f"cat {shlex.quote(options_path)}"),
+        ]
+        if preview_command:
+            actions.append(self._action("change-preview", preview_command))
+            actions.append("show-preview")
+        else:
+            actions.append("hide-preview")
+
+        self._drain_events()
+        if not self._post("+".join(actions)):
+            return None
+
+        valid_keys = {self._key(line) for line in lines}
+        while True:
+            event = self._read_event()
+            if event is None:
+                logger.info("User didn't select anything")
+                return None
+
+            name, *fields = event.split()
+            # Escape is also accepted with no line under the cursor
+            if name == "back" and fields in ([], [menu]):
+                raise NavigateBack
+
+            # Late key presses from a previous menu are ignored
+            if name != "select" or not fields or fields[0] != menu:
+                logger.debug(f"Ignoring fzf event of another menu: {event}")
+                continue
+            keys = fields[1:]
+            if keys and valid_keys.issuperset(keys) and (multi or len(keys) == 1):
+                return keys
+
+    def single_select(
+        self,
+        prompt_text: str,
+        options: List[str],
+        preview_command: Optional[str] = None,
+        keyed: bool = False,
+    ) -> Optional[str]:
+        if not self._supported:
+            return super().single_select(prompt_text, options, preview_command, keyed)
+        if not self._validate_options(options):
+            return None
+
+        lines = self._input_lines(options, keyed)
+        keys = self._show(prompt_text, lines, preview_command)
+        if keys is None and not self._supported:
+            return super().single_select(prompt_text, options, preview_command, keyed)
+        if not keys:
+            return None
+
+        return keys[0] if keyed else options[int(keys[0])]
+
+    def multi_select(
+        self, prompt_text: str, options: List[str], keyed: bool = False
+    ) -> Optional[Set[str]]:
+        if not self._supported:
+            return super().multi_select(prompt_text, options, keyed)
+        if not self._validate_options(options):
+            return None
+
+        lines = self._input_lines(options, keyed)
+        keys = self._show(prompt_text, lines, None, multi=True)
+        if keys is None and not self._supported:
+            return super().multi_select(prompt_text, options, keyed)
+        if not keys:
+            return None
+
+        return set(keys) if keyed else {options[int(key)] for key in keys}
+
+    def live_select(
+        self,
+        prompt_text: str,
+        query: str,
+        source_command: str,
+        preview_command: Optional[str] = None,
+        debounce: float = 0.2,
+    ) -> Optional[str]:
+        # Live search needs its own bindings, so it runs in a separate fzf
+        self.close()
+        return super().live_select(
+            prompt_text, query, source_command, preview_command, debounce
+        )
+
+    def _input_lines(self, options: List[str], keyed: bool) -> List[str]:
+        """
+        Builds fzf input lines with keys in the first field.
+
+        Args:
+            options: List of options.
+            keyed: Whether options are formatted with format_option().
+
+        Returns:
+            Input lines. Positions are used as keys for options without one.
+        """
+        if keyed:
+            return options
+        return [
+            self.format_option(index, option) for index, option in enumerate(options)
+        ]
+
+    def close(self) -> None:
+        """Closes fzf and removes its scratch directory."""
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._post("abort")
+                try:
+                    self._process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    self._process.terminate()
+                    self._process.wait()
+            self._process = None
+
+        if self._events is not None:
+            os.close(self._events)
+            self._events = None
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+        self._buffer = b""
+        self._api_key = ""
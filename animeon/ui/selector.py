@@ -1,10 +1,15 @@
 import logging
+import shlex
+import sys
 from typing import List, Optional
 
+from animeon.config import SearchConfig
 from animeon.models import Anime, Episode, Fandub, Player
+from animeon.utils.profiling import profiler
 
 from .preview import AnimePreviewGenerator
 from .prompt import Prompt
+from .session import SearchSession
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +18,10 @@ class ContentSelector:
     """Class for selecting anime content."""
 
     def __init__(
-        self, prompt: Prompt, preview_generator: AnimePreviewGenerator
+        self,
+        prompt: Prompt,
+        preview_generator: AnimePreviewGenerator,
+        config: Optional[SearchConfig] = None,
     ) -> None:
         """
         Initializes the class.
@@ -21,9 +29,52 @@ class ContentSelector:
         Args:
             prompt: Interface for user prompting.
             preview_generator: Object for creating previews of anime content.
+            config: Optional incremental search configuration. If not provided, default configuration will be used.
         """
         self.prompt = prompt
         self.preview_generator = preview_generator
+        self.config = config or SearchConfig.default()
+
+    def search_anime(
+        self, query: str, use_cache: bool = True, refresh: bool = False
+    ) -> Optional[Anime]:
+        """
+        Searches anime interactively, reloading results as the user types.
+
+        Args:
+            query: Initial search query. May be empty.
+            use_cache: Whether the search helper uses the response cache.
+            refresh: Whether the search helper ignores cached responses, while still storing new ones.
+
+        Returns:
+            Selected anime or None if no anime is selected.
+        """
+        session = SearchSession()
+        try:
+            command = [sys.executable, "-m", "animeon.ui.live_search", session.path]
+            if not use_cache:
+                command.append("--no-cache")
+            if refresh:
+                command.append("--refresh")
+            source_command = shlex.join(command)
+            preview_command = self.preview_generator.preview_command(session, lazy=True)
+
+            with profiler.stage("prompt.anime"):
+                selected = self.prompt.live_select(
+                    "Пошук аніме: ",
+                    query,
+                    source_command,
+                    preview_command=preview_command,
+                    debounce=self.config.debounce,
+                )
+
+            if not selected:
+                logger.info("Anime not selected")
+                return None
+
+            return session.get_anime(int(selected))
+        finally:
+            session.close()
 
     def select_anime(self, anime_list: List[Anime]) -> Optional[Anime]:
         """
@@ -35,17 +86,32 @@ class ContentSelector:
         Returns:
             Selected anime or None if no anime is selected.
         """
-        preview_file = self.preview_generator.generate(anime_list)
-        anime_titles = [anime.title for anime in anime_list]
-        selected_title = self.prompt.single_select(
-            "Оберіть аніме: ", anime_titles, preview_file=preview_file
-        )
-
-        if not selected_title:
+        session = SearchSession()
+        try:
+            with profiler.stage("preview"):
+                self.preview_generator.generate(anime_list, session)
+                preview_command = self.preview_generator.preview_command(session)
+
+            anime_by_id = {str(anime.id_): anime for anime in anime_list}
+            options = [
+                self.prompt.format_option(anime.id_, anime.title)
+                for anime in anime_list
+            ]
+            with profiler.stage("prompt.anime"):
+                selected = self.prompt.single_select(
+                    "Оберіть аніме: ",
+                    options,
+                    preview_command=preview_command,
+                    keyed=True,
+                )
+        finally:
+            session.close()
+
+        if not selected:
             logger.info("Anime not selected")
             return None
 
-        return next(anime for anime in anime_list if anime.title == selected_title)
+        return anime_by_id[selected]
 
     def select_fandub(self, fandubs: List[Fandub]) -> Optional[Fandub]:
         """
@@ -57,14 +123,20 @@ class ContentSelector:
         Returns:
             Selected fandub or None if no fandub is selected.
         """
-        fandub_names = [fandub.name for fandub in fandubs]
-        selected_name = self.prompt.single_select("Оберіть озвучення: ", fandub_names)
+        fandub_by_id = {str(fandub.id_): fandub for fandub in fandubs}
+        options = [
+            self.prompt.format_option(fandub.id_, fandub.name) for fandub in fandubs
+        ]
+        with profiler.stage("prompt.fandub"):
+            selected_id = self.prompt.single_select(
+                "Оберіть озвучення: ", options, keyed=True
+            )
 
-        if not selected_name:
+        if not selected_id:
             logger.info("Fandub not selected")
             return None
 
-        return next(fandub for fandub in fandubs if fandub.name == selected_name)
+        return fandub_by_id[selected_id]
 
     def select_player(self, players: List[Player]) -> Optional[Player]:
         """
@@ -76,14 +148,20 @@ class ContentSelector:
         Returns:
             Selected player or None if no player is selected.
         """
-        player_names = [player.name for player in players]
-        selected_name = self.prompt.single_select("Оберіть плеєр: ", player_names)
+        player_by_id = {str(player.id_): player for player in players}
+        options = [
+            self.prompt.format_option(player.id_, player.name) for player in players
+        ]
+        with profiler.stage("prompt.player"):
+            selected_id = self.prompt.single_select(
+                "Оберіть плеєр: ", options, keyed=True
+            )
 
-        if not selected_name:
+        if not selected_id:
             logger.info("Player not selected")
             return None
 
-        return next(player for player in players if player.name == selected_name)
+        return player_by_id[selected_id]
 
     def select_episodes(self, episodes: List[Episode]) -> Optional[List[Episode]]:
         """
@@ -95,17 +173,22 @@ class ContentSelector:
         Returns:
             Selected episodes or None if no episode is selected.
         """
-        episode_options = [f"Епізод {episode.episode}" for episode in episodes]
-        selected_options = self.prompt.multi_select(
-            "Оберіть епізоди: ", episode_options
-        )
+        options = [
+            self.prompt.format_option(episode.id_, f"Епізод {episode.episode}")
+            for episode in episodes
+        ]
+        with profiler.stage("prompt.episodes"):
+            selected_ids = self.prompt.multi_select(
+                "Оберіть епізоди: ", options, keyed=True
+            )
 
-        if not selected_options:
+        if not selected_ids:
             logger.info("Episodes not selected")
             return None
 
-        return [
-            episode
-            for episode in episodes
-            if f"Епізод {episode.episode}" in selected_options
-        ]
+        # Keeps the episode order regardless of the selection order
+        return [episode for episode in episodes if str(episode.id_) in selected_ids]
+
+    def close(self) -> None:
+        """Closes the prompt."""
+        self.prompt.close()
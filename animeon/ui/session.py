@@ -0,0 +1,155 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, List, Optional, Tuple
+
+from animeon.models import Anime
+
+logger = logging.getLogger(__name__)
+
+
+class SearchSession:
+    """
+    Scratch directory shared by the CLI and its fzf helper processes.
+
+    Stores every anime seen during the session, their rendered previews and
+    the result lists of completed queries, so helper processes can look
+    them up by ID and serve longer queries from the results of their
+    prefixes.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initializes the session.
+
+        Args:
+            path: Optional path to an existing session directory. If not provided, a new one is created.
+        """
+        self.path = path or tempfile.mkdtemp(prefix="animeon-session-")
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        """Builds file name for the query."""
+        return hashlib.sha1(query.casefold().encode()).hexdigest()
+
+    def _write(self, relative_path: str, data: Any) -> None:
+        """
+        Writes JSON file atomically, because helper processes may be killed at any time.
+
+        Args:
+            relative_path: Path relative to the session directory.
+            data: Data to write.
+        """
+        path = os.path.join(self.path, relative_path)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w", encoding="utf-8", dir=directory, prefix=".tmp-", delete=False
+        ) as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(file.name, path)
+
+    def _read(self, relative_path: str) -> Optional[Any]:
+        """
+        Reads JSON file.
+
+        Args:
+            relative_path: Path relative to the session directory.
+
+        Returns:
+            File data if the file exists and is valid, None otherwise.
+        """
+        try:
+            with open(os.path.join(self.path, relative_path), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def put_anime(self, anime: Anime) -> None:
+        """
+        Stores anime.
+
+        Args:
+            anime: Anime to store.
+        """
+        self._write(os.path.join("anime", f"{anime.id_}.json"), anime.to_dict())
+
+    def get_anime(self, anime_id: int) -> Optional[Anime]:
+        """
+        Loads stored anime.
+
+        Args:
+            anime_id: Anime ID.
+
+        Returns:
+            Anime if stored, None otherwise.
+        """
+        data = self._read(os.path.join("anime", f"{anime_id}.json"))
+        return Anime.from_dict(data) if data else None
+
+    def preview_path(self, anime_id: int) -> str:
+        """
+        Builds path to the rendered preview of the anime.
+
+        Args:
+            anime_id: Anime ID.
+
+        Returns:
+            Path to the preview file.
+        """
+        return os.path.join(self.path, "previews", str(anime_id))
+
+    def put_results(self, query: str, anime_ids: List[int]) -> None:
+        """
+        Stores complete result list of the query.
+
+        Args:
+            query: Search query.
+            anime_ids: IDs of the results in order.
+        """
+        self._write(os.path.join("queries", self._query_key(query)), anime_ids)
+
+    def get_results(self, query: str) -> Optional[List[Anime]]:
+        """
+        Loads stored result list of the query.
+
+        Args:
+            query: Search query.
+
+        Returns:
+            List of Anime if the query was completed in this session, None otherwise.
+        """
+        anime_ids = self._read(os.path.join("queries", self._query_key(query)))
+        if anime_ids is None:
+            return None
+
+        return [anime for anime_id in anime_ids if (anime := self.get_anime(anime_id))]
+
+    def find_prefix_results(self, query: str) -> Optional[Tuple[str, List[Anime]]]:
+        """
+        Finds results of the longest completed prefix of the query.
+
+        Args:
+            query: Search query.
+
+        Returns:
+            Prefix and those of its results whose title contains the query, or
+            None if no prefix was completed in this session.
+        """
+        needle = query.casefold()
+        for length in range(len(query) - 1, 0, -1):
+            prefix = query[:length]
+            results = self.get_results(prefix)
+            if results is not None:
+                return prefix, [
+                    anime for anime in results if needle in anime.title.casefold()
+                ]
+
+        return None
+
+    def close(self) -> None:
+        """Removes the session directory."""
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -1,5 +1,34 @@
-from .dependencies import check_dependencies
-from .logging import LoggerManager
-from .url import build_url, normalize_query
+from typing import TYPE_CHECKING
 
-__all__ = ["check_dependencies", "LoggerManager", "build_url", "normalize_query"]
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .dependencies import check_dependencies
+    from .logging import LoggerManager
+    from .paths import get_cache_dir, get_state_dir
+    from .transliteration import transliterate
+    from .url import build_url, normalize_query
+
+__all__ = [
+    "check_dependencies",
+    "LoggerManager",
+    "get_cache_dir",
+    "get_state_dir",
+    "build_url",
+    "normalize_query",
+    "lazy_exports",
+    "transliterate",
+]
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "check_dependencies": ".dependencies",
+        "LoggerManager": ".logging",
+        "get_cache_dir": ".paths",
+        "get_state_dir": ".paths",
+        "build_url": ".url",
+        "normalize_query": ".url",
+        "transliterate": ".transliteration",
+    },
+)
@@ -1,5 +1,13 @@
+import json
 import logging
+import os
+import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .paths import get_state_dir
 
 logger = logging.getLogger(__name__)
 
@@ -7,20 +15,129 @@ DEPENDENCIES = {
     "fzf": ["fzf", "--version"],
     "mpv": ["mpv", "--version"],
     "chafa": ["chafa", "--version"],
-    "jq": ["jq", "--version"],
 }
+# Without these the application can still run with reduced previews
+OPTIONAL_DEPENDENCIES = {"chafa"}
+
+
+def _load_state(path: str) -> Dict[str, Any]:
+    """
+    Loads cached probe results.
+
+    Args:
+        path: Path to the state file.
+
+    Returns:
+        Dictionary of probe results by dependency name.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    return state if isinstance(state, dict) else {}
+
+
+def _save_state(path: str, state: Dict[str, Any]) -> None:
+    """
+    Saves probe results atomically.
+
+    Args:
+        path: Path to the state file.
+        state: Dictionary of probe results by dependency name.
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w", encoding="utf-8", dir=directory, delete=False
+        ) as file:
+            json.dump(state, file)
+        os.replace(file.name, path)
+    except OSError as error:
+        logger.debug(f"Failed to save dependency state: {error}")
+
+
+def _probe(command: List[str]) -> Optional[str]:
+    """
+    Runs version command of the dependency.
+
+    Args:
+        command: Command to run.
+
+    Returns:
+        First line of the version output if the command succeeded, None otherwise.
+    """
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=10)
+    except (subprocess.SubprocessError, OSError):
+        return None
 
+    if result.returncode != 0:
+        return None
 
-def check_dependencies() -> None:
-    """Checks all required dependencies."""
+    lines = result.stdout.strip().splitlines()
+    return lines[0] if lines else ""
+
+
+def check_dependencies() -> List[str]:
+    """
+    Checks all dependencies.
+
+    Binaries are located via PATH. A version probe is only run for binaries
+    whose path or modification time changed since the last successful check,
+    and all such probes run in parallel.
+
+    Returns:
+        Names of missing required dependencies.
+    """
     logger.debug("Checking dependencies...")
 
+    state_path = get_state_dir("dependencies.json")
+    state = _load_state(state_path)
+    new_state: Dict[str, Any] = {}
+    to_probe: Dict[str, List[str]] = {}
+    missing = []
+
     for name, command in DEPENDENCIES.items():
-        try:
-            logger.debug(f"Checking if {name} is installed")
-            with subprocess.Popen(
-                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            ) as process:
-                process.communicate()
-        except (subprocess.SubprocessError, FileNotFoundError):
+        path = shutil.which(command[0])
+        if not path:
+            missing.append(name)
+            continue
+
+        mtime = os.stat(path).st_mtime
+        cached = state.get(name)
+        if cached and cached.get("path") == path and cached.get("mtime") == mtime:
+            logger.debug(f"{name} is installed: {cached.get('version')}")
+            new_state[name] = cached
+            continue
+
+        new_state[name] = {"path": path, "mtime": mtime}
+        to_probe[name] = [path, *command[1:]]
+
+    if to_probe:
+        logger.debug(f"Probing dependencies: {', '.join(to_probe)}")
+        with ThreadPoolExecutor(max_workers=len(to_probe)) as executor:
+            versions = dict(zip(to_probe, executor.map(_probe, to_probe.values())))
+
+        for name, version in versions.items():
+            if version is None:
+                missing.append(name)
+                del new_state[name]
+            else:
+                logger.debug(f"{name} is installed: {version}")
+                new_state[name]["version"] = version
+
+    if new_state != state:
+        _save_state(state_path, new_state)
+
+    required_missing = []
+    for name in missing:
+        if name in OPTIONAL_DEPENDENCIES:
+            logger.warning(f"{name} is not installed!")
+        else:
             logger.error(f"{name} is not installed!")
+            required_missing.append(name)
+
+    return required_missing
@@ -0,0 +1,72 @@
+import codecs
+import json
+import re
+from itertools import chain
+from typing import Any, Iterable, Iterator, Optional
+
+SEPARATORS = " \t\r\n,"
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Parses items of a JSON array incrementally as the document arrives.
+
+    The array is the value of the first occurrence of the key in the
+    document, which is enough for flat API responses like {"result": [...]}.
+    Each item is decoded as soon as it is complete, and the consumed part of
+    the input is discarded.
+
+    Args:
+        chunks: Iterable of UTF-8 encoded document chunks.
+        key: Key of the array.
+
+    Yields:
+        Decoded array items.
+
+    Raises:
+        ValueError: If the array is missing or the document is malformed.
+    """
+    array_start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    json_decoder = json.JSONDecoder()
+    buffer = ""
+    position: Optional[int] = None
+
+    for chunk in chain(chunks, [None]):
+        final = chunk is None
+        buffer += utf8_decoder.decode(chunk or b"", final=final)
+
+        if position is None:
+            match = array_start.search(buffer)
+            if not match:
+                if final:
+                    raise ValueError(f'Array "{key}" not found')
+                continue
+            position = match.end()
+
+        while True:
+            while position < len(buffer) and buffer[position] in SEPARATORS:
+                position += 1
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                return
+
+            try:
+                item, end = json_decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # Item is not complete yet
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(buffer) and not final:
+                break
+
+            yield item
+            position = end
+
+        buffer = buffer[position:]
+        position = 0
+
+    raise ValueError(f'Array "{key}" is not terminated')
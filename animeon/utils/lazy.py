@@ -0,0 +1,29 @@
+import importlib
+import sys
+from typing import Any, Callable, Mapping
+
+
+def lazy_exports(package: str, exports: Mapping[str, str]) -> Callable[[str], Any]:
+    """
+    Creates module __getattr__ that imports exported names on first access.
+
+    Keeps heavy modules out of the import chain of commands that do not need them.
+
+    Args:
+        package: Name of the package.
+        exports: Mapping of exported names to relative module names.
+
+    Returns:
+        Function to be used as module __getattr__.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -0,0 +1,49 @@
+import os
+
+
+def _get_xdg_dir(variable: str, fallback: str, *parts: str) -> str:
+    """
+    Builds path inside the application directory of the XDG base directory.
+
+    Args:
+        variable: Name of the XDG environment variable.
+        fallback: Directory relative to home used if the variable is not set.
+        parts: Path components inside the application directory.
+
+    Returns:
+        Path to the directory. It is not created automatically.
+    """
+    base_dir = os.environ.get(variable) or os.path.join(
+        os.path.expanduser("~"), fallback
+    )
+    return os.path.join(base_dir, "animeon", *parts)
+
+
+def get_cache_dir(*parts: str) -> str:
+    """
+    Builds path inside the application cache directory.
+
+    Respects XDG_CACHE_HOME and falls back to ~/.cache.
+
+    Args:
+        parts: Path components inside the cache directory.
+
+    Returns:
+        Path to the directory. It is not created automatically.
+    """
+    return _get_xdg_dir("XDG_CACHE_HOME", ".cache", *parts)
+
+
+def get_state_dir(*parts: str) -> str:
+    """
+    Builds path inside the application state directory.
+
+    Respects XDG_STATE_HOME and falls back to ~/.local/state.
+
+    Args:
+        parts: Path components inside the state directory.
+
+    Returns:
+        Path to the directory. It is not created automatically.
+    """
+    return _get_xdg_dir("XDG_STATE_HOME", os.path.join(".local", "state"), *parts)
@@ -0,0 +1,272 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Span:
+    """
+    Timed interval of work.
+
+    Attributes:
+        name: Stage or endpoint name.
+        category: Kind of work, for example "stage" or "http".
+        start: Start time in seconds relative to the profiler start.
+        duration: Duration in seconds.
+        thread_id: ID of the thread that did the work.
+    """
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    """
+    Request metrics of a single endpoint.
+
+    Attributes:
+        requests: Number of requests made.
+        errors: Number of failed requests.
+        bytes: Total size of received bodies.
+        time: Total request time in seconds.
+        cache_hits: Number of responses served from a cache without a request.
+        retries: Number of retried requests.
+        hedges: Number of hedged requests sent because a request was slow.
+    """
+
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    time: float = 0.0
+    cache_hits: int = 0
+    retries: int = 0
+    hedges: int = 0
+
+
+class Profiler:
+    """Collects stage timings and request metrics of a session."""
+
+    def __init__(self) -> None:
+        """Initializes the profiler. It is disabled until enable() is called."""
+        self.enabled = False
+        self._origin = time.perf_counter()
+        self._spans: List[Span] = []
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Enables collection and resets collected data."""
+        with self._lock:
+            self.enabled = True
+            self._origin = time.perf_counter()
+            self._spans.clear()
+            self._endpoints.clear()
+
+    def _add_span(self, name: str, category: str, start: float, end: float) -> None:
+        """
+        Stores a finished span.
+
+        Args:
+            name: Stage or endpoint name.
+            category: Kind of work, for example "stage" or "http".
+            start: Start time from time.perf_counter().
+            end: End time from time.perf_counter().
+        """
+        span = Span(
+            name=name,
+            category=category,
+            start=start - self._origin,
+            duration=end - start,
+            thread_id=threading.get_ident(),
+        )
+        with self._lock:
+            self._spans.append(span)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Measures duration of a stage.
+
+        Args:
+            name: Stage name.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._add_span(name, "stage", start, end)
+            logger.debug(f"Stage {name} took {(end - start) * 1000:.1f} ms")
+
+    def record_request(
+        self, endpoint: str, start: float, size: int, failed: bool = False
+    ) -> None:
+        """
+        Records a finished HTTP request.
+
+        Args:
+            endpoint: Endpoint name.
+            start: Request start time from time.perf_counter().
+            size: Size of the received body in bytes.
+            failed: Whether the request failed.
+        """
+        if not self.enabled:
+            return
+
+        end = time.perf_counter()
+        self._add_span(endpoint, "http", start, end)
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.errors += failed
+            stats.bytes += size
+            stats.time += end - start
+
+    def record_cache_hit(self, endpoint: str) -> None:
+        """
+        Records a response served from a cache.
+
+        Args:
+            endpoint: Endpoint name.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointStats()).cache_hits += 1
+
+    def record_retry(self, endpoint: str) -> None:
+        """
+        Records a retry of a failed request.
+
+        Args:
+            endpoint: Endpoint name.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointStats()).retries += 1
+
+    def record_hedge(self, endpoint: str) -> None:
+        """
+        Records a hedged request.
+
+        Args:
+            endpoint: Endpoint name.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointStats()).hedges += 1
+
+    def summary(self) -> str:
+        """
+        Formats collected data as a table.
+
+        Returns:
+            Table of stage durations and endpoint metrics.
+        """
+        with self._lock:
+            spans = sorted(
+                (span for span in self._spans if span.category == "stage"),
+                key=lambda span: span.start,
+            )
+            endpoints = dict(self._endpoints)
+
+        lines = [f"{'stage':<24} {'start, ms':>10} {'time, ms':>10}"]
+        for span in spans:
+            lines.append(
+                f"{span.name:<24} {span.start * 1000:>10.1f} "
+                f"{span.duration * 1000:>10.1f}"
+            )
+
+        lines.append("")
+        lines.append(
+            f"{'endpoint':<24} {'requests':>8} {'errors':>6} {'KiB':>9} "
+            f"{'time, ms':>10} {'cache hits':>10} {'retries':>7} {'hedges':>6}"
+        )
+        for name, stats in sorted(endpoints.items()):
+            lines.append(
+                f"{name:<24} {stats.requests:>8} {stats.errors:>6} "
+                f"{stats.bytes / 1024:>9.1f} {stats.time * 1000:>10.1f} "
+                f"{stats.cache_hits:>10} {stats.retries:>7} {stats.hedges:>6}"
+            )
+
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns collected data as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with spans and endpoint metrics.
+        """
+        with self._lock:
+            return {
+                "spans": [asdict(span) for span in self._spans],
+                "endpoints": {
+                    name: asdict(stats) for name, stats in self._endpoints.items()
+                },
+            }
+
+    def to_trace(self) -> Dict[str, Any]:
+        """
+        Returns collected spans in Chrome trace event format.
+
+        The result can be opened in chrome://tracing or Perfetto.
+
+        Returns:
+            Trace data.
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start * 1_000_000,
+                    "dur": span.duration * 1_000_000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                }
+                for span in self._spans
+            ]
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str, format: Optional[str] = None) -> None:
+        """
+        Writes collected data to a file.
+
+        Args:
+            path: Output file path.
+            format: Output format, "json" or "trace". Defaults to "json".
+        """
+        data = self.to_trace() if format == "trace" else self.to_dict()
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, indent=4)
+        except OSError as error:
+            logger.error(f"Failed to write profile: {error}")
+
+
+# Shared by all components, so they can report without passing it around
+profiler = Profiler()
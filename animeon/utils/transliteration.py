@@ -0,0 +1,66 @@
+import re
+
+# Ukrainian and Russian letters as they are used to spell Japanese titles,
+# for example "Гінтама" -> "gintama", "Наруто Шіппуден" -> "naruto shippuden"
+CYRILLIC_TO_LATIN = str.maketrans(
+    {
+        "а": "a",
+        "б": "b",
+        "в": "v",
+        "г": "g",
+        "ґ": "g",
+        "д": "d",
+        "е": "e",
+        "є": "ye",
+        "ё": "yo",
+        "ж": "zh",
+        "з": "z",
+        "и": "y",
+        "і": "i",
+        "ї": "yi",
+        "й": "y",
+        "к": "k",
+        "л": "l",
+        "м": "m",
+        "н": "n",
+        "о": "o",
+        "п": "p",
+        "р": "r",
+        "с": "s",
+        "т": "t",
+        "у": "u",
+        "ф": "f",
+        "х": "h",
+        "ц": "ts",
+        "ч": "ch",
+        "ш": "sh",
+        "щ": "shch",
+        "ы": "y",
+        "э": "e",
+        "ю": "yu",
+        "я": "ya",
+        "ь": "",
+        "ъ": "",
+        "'": "",
+        "’": "",
+        "ʼ": "",
+    }
+)
+NON_ALPHANUMERIC_PATTERN = re.compile(r"[\W_]+")
+
+
+def transliterate(text: str) -> str:
+    """
+    Normalizes text for matching across scripts.
+
+    Cyrillic letters are transliterated to Latin, the text is case folded,
+    and punctuation is collapsed into single spaces.
+
+    Args:
+        text: Text to normalize.
+
+    Returns:
+        Normalized text.
+    """
+    text = text.casefold().translate(CYRILLIC_TO_LATIN)
+    return NON_ALPHANUMERIC_PATTERN.sub(" ", text).strip()
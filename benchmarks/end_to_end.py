@@ -0,0 +1,285 @@
+"""
+Offline benchmarks of the API client, previews and search flow.
+
+Runs against a local mock AnimeOn server, so results do not depend on the
+network. Reports p50/p95 latency and the number of requests per iteration.
+
+Usage:
+    python benchmarks/end_to_end.py [--iterations N] [--latency MS] [--json PATH]
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockAnimeOnServer, MockConfig
+
+from animeon.config import CacheConfig, PreviewConfig, RateLimitConfig
+from animeon.core import (
+    AnimeAPI,
+    DiskCache,
+    HTTPClient,
+    PosterCache,
+    Prefetcher,
+    RateLimiter,
+)
+from animeon.models import Anime, Episode, Fandub, Player
+from animeon.ui.commands import SearchCommand
+from animeon.ui.player import VideoPlayer
+from animeon.ui.preview import AnimePreviewGenerator
+from animeon.ui.session import SearchSession
+
+
+class AutoSelector:
+    """Selector that picks the first options without user interaction."""
+
+    def __init__(self, think_time: float = 0.0) -> None:
+        """
+        Initializes the selector.
+
+        Args:
+            think_time: Delay simulating the user choosing in each menu, in seconds.
+        """
+        self.think_time = think_time
+
+    def _think(self) -> None:
+        if self.think_time:
+            time.sleep(self.think_time)
+
+    def select_anime(self, anime_list: List[Anime]) -> Optional[Anime]:
+        self._think()
+        return anime_list[0]
+
+    def select_fandub(self, fandubs: List[Fandub]) -> Optional[Fandub]:
+        self._think()
+        return fandubs[0]
+
+    def select_player(self, players: List[Player]) -> Optional[Player]:
+        self._think()
+        return players[0]
+
+    def select_episodes(self, episodes: List[Episode]) -> Optional[List[Episode]]:
+        self._think()
+        return episodes
+
+    def close(self) -> None:
+        pass
+
+
+class CollectingPlayer(VideoPlayer):
+    """Player that only collects URLs."""
+
+    def __init__(self) -> None:
+        self.urls: List[str] = []
+
+    def play(self, urls: Iterable[str]) -> None:
+        self.urls = list(urls)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Calculates percentile with the nearest-rank method.
+
+    Args:
+        values: Measured values.
+        percent: Percentile in range 0-100.
+
+    Returns:
+        Percentile value.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def run_scenario(
+    name: str,
+    server: MockAnimeOnServer,
+    iterations: int,
+    function: Callable[[], Any],
+    setup: Optional[Callable[[], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Runs scenario several times and collects statistics.
+
+    Args:
+        name: Scenario name.
+        server: Mock server.
+        iterations: Number of iterations.
+        function: Function to measure.
+        setup: Optional function called before each iteration, not measured.
+
+    Returns:
+        Scenario statistics.
+    """
+    server.reset_counters()
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    requests = {
+        endpoint: count / iterations for endpoint, count in server.requests.items()
+    }
+    result = {
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "requests": requests,
+    }
+    print(
+        f"{name:<28} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f}  "
+        + ", ".join(
+            f"{endpoint}={count:g}" for endpoint, count in sorted(requests.items())
+        )
+    )
+    return result
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=20.0, help="Server latency, ms"
+    )
+    parser.add_argument("--results", type=int, default=20, help="Search results")
+    parser.add_argument("--episodes", type=int, default=12, help="Episodes per player")
+    parser.add_argument("--description-size", type=int, default=500)
+    parser.add_argument("--poster-size", type=int, default=30, help="Poster size, KiB")
+    parser.add_argument(
+        "--think-time", type=float, default=0.0, help="User delay per menu, ms"
+    )
+    parser.add_argument("--json", metavar="PATH", help="Writes results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    config = MockConfig(
+        latency=args.latency / 1000,
+        results=args.results,
+        description_size=args.description_size,
+        episodes=args.episodes,
+        poster_size=args.poster_size * 1024,
+    )
+
+    results: Dict[str, Any] = {}
+    with (
+        MockAnimeOnServer(config) as server,
+        tempfile.TemporaryDirectory() as cache_dir,
+    ):
+        # Iterations run back to back, so the default budget would dominate timings
+        rate_limiter = RateLimiter(
+            RateLimitConfig(
+                rate=1_000_000,
+                burst=1_000_000,
+                min_rate=1_000_000,
+                decrease_factor=1.0,
+                increase_step=0.0,
+                max_in_flight=1_000,
+            )
+        )
+        http_client = HTTPClient(rate_limiter=rate_limiter)
+        api = AnimeAPI(http_client)
+        api.BASE_URL = server.url
+
+        anime_list = api.search("benchmark") or []
+        fandubs = api.get_fandubs_and_players(anime_list[0].id_) or []
+        player = fandubs[0].players[0]
+        episodes = api.get_episodes(player.id_, fandubs[0].id_) or []
+        episode_ids = [episode.id_ for episode in episodes]
+
+        poster_dir = os.path.join(cache_dir, "posters")
+        render_dir = os.path.join(cache_dir, "previews")
+        cache_config = CacheConfig.default()
+        preview_generator = AnimePreviewGenerator(
+            http_client,
+            PreviewConfig(lazy=False, chafa_size="45x25", download_workers=8),
+            PosterCache(
+                http_client,
+                cache_config,
+                DiskCache(poster_dir, cache_config.poster_max_size),
+            ),
+            DiskCache(render_dir, cache_config.render_max_size),
+        )
+
+        def clear_caches() -> None:
+            for directory in (poster_dir, render_dir):
+                for name in os.listdir(directory) if os.path.isdir(directory) else []:
+                    os.remove(os.path.join(directory, name))
+
+        def generate_previews() -> None:
+            session = SearchSession()
+            preview_generator.generate(anime_list, session)
+            session.close()
+
+        def first_search_result() -> None:
+            results = api.iter_search("benchmark")
+            next(results, None)
+            results.close()
+
+        print(f"{'scenario':<28} {'p50, ms':>9} {'p95, ms':>9}  requests per iteration")
+        scenarios: Dict[str, Any] = {
+            "api.search": lambda: api.search("benchmark"),
+            "api.iter_search (first)": first_search_result,
+            "api.get_fandubs_and_players": lambda: api.get_fandubs_and_players(
+                anime_list[0].id_
+            ),
+            "api.get_episodes": lambda: api.get_episodes(player.id_, fandubs[0].id_),
+            "api.get_video_urls": lambda: api.get_video_urls(episode_ids),
+        }
+        for name, function in scenarios.items():
+            results[name] = run_scenario(name, server, args.iterations, function)
+
+        results["previews (cold cache)"] = run_scenario(
+            "previews (cold cache)",
+            server,
+            args.iterations,
+            generate_previews,
+            setup=clear_caches,
+        )
+        results["previews (warm cache)"] = run_scenario(
+            "previews (warm cache)",
+            server,
+            args.iterations,
+            generate_previews,
+        )
+
+        think_time = args.think_time / 1000
+        for prefetch in (False, True):
+            name = f"search command{' (prefetch)' if prefetch else ''}"
+
+            def search(prefetch: bool = prefetch) -> None:
+                prefetcher = Prefetcher() if prefetch else None
+                command = SearchCommand(
+                    api,
+                    AutoSelector(think_time),  # type: ignore
+                    CollectingPlayer(),
+                    prefetcher,
+                )
+                command.execute("benchmark")
+                if prefetcher:
+                    prefetcher.close()
+
+            results[name] = run_scenario(name, server, args.iterations, search)
+
+        http_client.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
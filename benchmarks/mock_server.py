@@ -0,0 +1,245 @@
+"""
+Local stand-in for the AnimeOn API used by benchmarks.
+
+Responses are generated from MockConfig rather than replayed from recorded
+traffic, so they match the shape of real responses but not their content.
+The search route ignores the query and always returns the same results.
+Recorded fixtures are replayed by animeon.core.fixtures instead.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+
+@dataclass
+class MockConfig:
+    """
+    Shape of the generated responses.
+
+    Attributes:
+        latency: Delay before each response in seconds.
+        results: Number of anime returned by search.
+        description_size: Length of each anime description in characters.
+        fandubs: Number of fandubs per anime.
+        players: Number of players per fandub.
+        episodes: Number of episodes per player.
+        poster_size: Size of each poster image in bytes.
+    """
+
+    latency: float = 0.0
+    results: int = 20
+    description_size: int = 500
+    fandubs: int = 3
+    players: int = 2
+    episodes: int = 12
+    poster_size: int = 30 * 1024
+
+
+def make_search_results(config: MockConfig) -> Dict[str, Any]:
+    """
+    Builds search response with generated anime.
+
+    Args:
+        config: Shape of the response.
+
+    Returns:
+        Search response data.
+    """
+    description = ("Опис [посилання](https://example.com) " * config.description_size)[
+        : config.description_size
+    ]
+    result: List[Dict[str, Any]] = [
+        {
+            "id": index,
+            "titleUa": f"Аніме {index}",
+            "image": {"original": f"poster-{index}.jpg"},
+            "malScored": 8.0,
+            "malScoredBy": 1000,
+            "type": "tv",
+            "episodes": config.episodes,
+            "episodesAired": config.episodes,
+            "status": "released",
+            "releaseDate": "2020",
+            "producer": "Studio",
+            "description": description,
+            "malId": index,
+        }
+        for index in range(1, config.results + 1)
+    ]
+    return {"result": result}
+
+
+def make_fandubs(config: MockConfig, anime_id: int) -> List[Dict[str, Any]]:
+    """
+    Builds fandubs response.
+
+    Args:
+        config: Shape of the response.
+        anime_id: Anime ID.
+
+    Returns:
+        Fandubs response data.
+    """
+    return [
+        {
+            "fundub": {"id": anime_id * 100 + fandub, "name": f"Студія {fandub}"},
+            "player": [
+                {
+                    "id": anime_id * 1000 + fandub * 10 + player,
+                    "name": f"Плеєр {player}",
+                }
+                for player in range(1, config.players + 1)
+            ],
+        }
+        for fandub in range(1, config.fandubs + 1)
+    ]
+
+
+def make_episodes(config: MockConfig, player_id: int) -> List[Dict[str, Any]]:
+    """
+    Builds episodes response.
+
+    Args:
+        config: Shape of the response.
+        player_id: Player ID.
+
+    Returns:
+        Episodes response data.
+    """
+    return [
+        {"id": player_id * 1000 + episode, "episode": episode}
+        for episode in range(1, config.episodes + 1)
+    ]
+
+
+class MockAnimeOnServer:
+    """HTTP server serving generated AnimeOn API responses on localhost."""
+
+    def __init__(self, config: Optional[MockConfig] = None) -> None:
+        """
+        Initializes the server.
+
+        Args:
+            config: Optional shape of the responses. If not provided, default shape will be used.
+        """
+        self.config = config or MockConfig()
+        self.requests: Counter = Counter()
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[str, re.Pattern, Callable[..., Tuple[str, bytes]]]] = [
+            ("search", re.compile(r"^/api/anime/search/[^/]+$"), self._search),
+            ("fandubs", re.compile(r"^/api/player/fundubs/(\d+)$"), self._fandubs),
+            (
+                "episodes",
+                re.compile(r"^/api/player/episodes/(\d+)/(\d+)$"),
+                self._episodes,
+            ),
+            ("episode", re.compile(r"^/api/player/episode/(\d+)$"), self._episode),
+            ("poster", re.compile(r"^/api/uploads/images/.+$"), self._poster),
+        ]
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._create_handler())
+        self._server.daemon_threads = True
+        # Clients closing streamed responses early reset the connection
+        self._server.handle_error = lambda request, client_address: None  # type: ignore
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self) -> None:
+        """Resets request counters."""
+        with self._lock:
+            self.requests.clear()
+
+    def _search(self) -> Tuple[str, bytes]:
+        # The query is not matched, every search returns the generated results
+        return "application/json", json.dumps(make_search_results(self.config)).encode()
+
+    def _fandubs(self, anime_id: str) -> Tuple[str, bytes]:
+        data = make_fandubs(self.config, int(anime_id))
+        return "application/json", json.dumps(data).encode()
+
+    def _episodes(self, player_id: str, fandub_id: str) -> Tuple[str, bytes]:
+        data = make_episodes(self.config, int(player_id))
+        return "application/json", json.dumps(data).encode()
+
+    def _episode(self, episode_id: str) -> Tuple[str, bytes]:
+        data = {"videoUrl": f"{self.url}/video/{episode_id}.m3u8"}
+        return "application/json", json.dumps(data).encode()
+
+    def _poster(self) -> Tuple[str, bytes]:
+        return "image/jpeg", b"\xff" * self.config.poster_size
+
+    def _route(self, path: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        Finds response for the request path.
+
+        Args:
+            path: Request path without query.
+
+        Returns:
+            Endpoint name, content type and body if the path is known, None otherwise.
+        """
+        for name, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match:
+                return (name, *handler(*match.groups()))
+        return None
+
+    def _create_handler(self) -> Type[BaseHTTPRequestHandler]:
+        """Creates request handler bound to this server."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                if server.config.latency:
+                    time.sleep(server.config.latency)
+
+                route = server._route(self.path.split("?", 1)[0])
+                name, content_type, body = route or ("unknown", "text/plain", b"")
+                with server._lock:
+                    server.requests[name] += 1
+
+                self.send_response(200 if route else 404)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "MockAnimeOnServer":
+        """Starts serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockAnimeOnServer":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
@@ -0,0 +1,217 @@
+"""
+Startup time benchmark for the animeon entry point.
+
+Measures `python -X importtime` of animeon.__main__ and wall-clock time of
+`--version`, `--help` and a search against a local mock server. Cold runs
+use a fresh bytecode cache, warm runs reuse it. Exits with status 1 if a
+warm median exceeds its threshold.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--threshold NAME=MS ...] [--json PATH]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockAnimeOnServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_THRESHOLDS = {"version": 150.0, "help": 150.0, "search": 500.0}
+
+# Runs the real entry point, but stops right after the search request
+SEARCH_SNIPPET = """
+import sys
+import animeon.utils.dependencies as dependencies
+from animeon.core.api import AnimeAPI
+from animeon.ui.selector import ContentSelector
+
+dependencies.check_dependencies = lambda: []
+AnimeAPI.BASE_URL = sys.argv[1]
+ContentSelector.select_anime = lambda self, anime_list: None
+sys.argv = ["animeon", "--no-cache", "naruto"]
+
+from animeon.__main__ import main
+
+main()
+"""
+
+
+def build_command(scenario: str, server_url: str) -> List[str]:
+    """
+    Builds command for the scenario.
+
+    Args:
+        scenario: Scenario name.
+        server_url: URL of the mock server.
+
+    Returns:
+        Command to run.
+    """
+    if scenario == "search":
+        return [sys.executable, "-c", SEARCH_SNIPPET, server_url]
+    return [sys.executable, "-m", "animeon", f"--{scenario}"]
+
+
+def run_once(command: List[str], env: Dict[str, str]) -> float:
+    """
+    Runs the command once.
+
+    Args:
+        command: Command to run.
+        env: Environment variables.
+
+    Returns:
+        Wall-clock time in milliseconds.
+    """
+    start = time.perf_counter()
+    subprocess.run(command, env=env, cwd=ROOT, capture_output=True, check=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(command: List[str], env: Dict[str, str], runs: int) -> Tuple[float, float]:
+    """
+    Measures cold and warm wall-clock time of the command.
+
+    Args:
+        command: Command to run.
+        env: Environment variables.
+        runs: Number of runs of each kind.
+
+    Returns:
+        Median cold and warm times in milliseconds.
+    """
+    cold = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as pycache:
+            cold.append(
+                run_once(
+                    [command[0], "-X", f"pycache_prefix={pycache}", *command[1:]], env
+                )
+            )
+
+    run_once(command, env)  # Primes the bytecode cache
+    warm = [run_once(command, env) for _ in range(runs)]
+
+    return statistics.median(cold), statistics.median(warm)
+
+
+def import_time(env: Dict[str, str]) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Measures import time of the entry point module.
+
+    Args:
+        env: Environment variables.
+
+    Returns:
+        Total import time in milliseconds and the slowest imported modules.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import animeon.__main__"],
+        env=env,
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    modules = []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        milliseconds = int(cumulative) / 1000
+        modules.append((milliseconds, name.strip()))
+        if name.strip() == "animeon.__main__":
+            total = milliseconds
+
+    modules.sort(reverse=True)
+    return total, modules[:10]
+
+
+def parse_thresholds(values: Optional[List[str]]) -> Dict[str, float]:
+    """
+    Parses threshold overrides.
+
+    Args:
+        values: List of NAME=MS strings.
+
+    Returns:
+        Thresholds by scenario name.
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for value in values or []:
+        name, milliseconds = value.split("=", 1)
+        thresholds[name] = float(milliseconds)
+    return thresholds
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument(
+        "--threshold",
+        action="append",
+        metavar="NAME=MS",
+        help="Maximum warm median for the scenario",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Writes results as JSON")
+    args = parser.parse_args()
+    thresholds = parse_thresholds(args.threshold)
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {
+            **os.environ,
+            "PYTHONPATH": ROOT,
+            "XDG_CACHE_HOME": os.path.join(home, "cache"),
+            "XDG_STATE_HOME": os.path.join(home, "state"),
+        }
+
+        total_import, slowest = import_time(env)
+        print(f"Import time of animeon.__main__: {total_import:.1f} ms")
+        for milliseconds, name in slowest:
+            print(f"  {milliseconds:8.1f} ms  {name}")
+        print()
+
+        results: Dict[str, Dict[str, float]] = {}
+        failed = False
+        with MockAnimeOnServer() as server:
+            print(
+                f"{'scenario':<10} {'cold, ms':>10} {'warm, ms':>10} {'limit, ms':>10}"
+            )
+            for scenario in ("version", "help", "search"):
+                cold, warm = measure(
+                    build_command(scenario, server.url), env, args.runs
+                )
+                limit = thresholds[scenario]
+                status = "" if warm <= limit else "  REGRESSION"
+                failed = failed or warm > limit
+                results[scenario] = {
+                    "cold_ms": cold,
+                    "warm_ms": warm,
+                    "limit_ms": limit,
+                }
+                print(
+                    f"{scenario:<10} {cold:>10.1f} {warm:>10.1f} {limit:>10.1f}{status}"
+                )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"import_ms": total_import, "scenarios": results}, file, indent=4)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()